@@ -1,25 +1,43 @@
 import argparse
 import ctypes
+import gzip
+import io
 import json
+import math
 import os
+import queue
 import re
+import shutil
+import signal
+import socket
+import socketserver
 import sys
+import threading
 import time
 import tomllib
+from collections import deque
 from datetime import datetime, timezone
+from functools import lru_cache, partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.request import urlopen
 try:
-    from discord_webhook import DiscordWebhook
-    discord_enabled = True
+    import requests
+    import requests.adapters
+    discord_available = True
 except ImportError:
-    discord_enabled = False
-    print("discord-webhook unavailable - operating with terminal output only\n")
+    discord_available = False
+    print("requests unavailable - operating with terminal output only\n")
+try:
+    import zstandard
+    zstd_available = True
+except ImportError:
+    zstd_available = False
 
 def fallover(message):
     print(message)
-    if sys.argv[0].count("\\") > 1: input("Press ENTER to exit")
-    sys.exit()
+    if sys.argv[0].count("\\") > 1 and not setting_daemon: input("Press ENTER to exit")
+    sys.exit(1 if setting_daemon else None)	# Services need to see a failed start as one
 
 # Internals
 DEBUG_MODE = False
@@ -27,20 +45,60 @@ DISCORD_TEST = False
 VERSION = 251009
 GITHUB_REPO = "PsiPab/ED-AFK-Monitor"
 DUPE_MAX = 5
+DISCORD_DEFAULT = "Default"	# Webhook name used for 'WebhookURL'
+DISCORD_TIMEOUT = 10
+DISCORD_RETRIES = 3
+DISCORD_POOL = 4	# Keep-alive connections shared by all webhooks (more if there are more webhooks)
+SINK_QUEUE = 1000	# Pending alerts per network output before new ones are dropped (local outputs wait instead)
+SINK_CLOSE = 10		# Seconds to wait for each output to drain at exit
 MAX_FILES = 10
 FUEL_LOW = 0.2		# 20%
 FUEL_CRIT = 0.1		# 10%
 TRUNC_FACTION = 30
 KILLS_RECENT = 10
+CACHE_NAMES = 256	# Ship and faction names remembered for messages
+CACHE_TIMES = 1024	# Formatted whole durations and numbers remembered for messages
+DASH_FPS = 4		# Maximum dashboard redraws per second
+DASH_EVENTS = 50	# Recent events kept for the dashboard
+DASH_BAR = 20		# Width of the dashboard mission progress bar
+WEB_EVENTS = 50		# Recent events sent to new web dashboard viewers
+WEB_STATUS = 2		# Seconds between web dashboard counter updates
+WEB_KEEPALIVE = 15	# Seconds between keepalives to idle web dashboard viewers
+CONTROL_SOCKET = "afk_monitor.sock"	# Default control socket (next to the config file) in daemon mode
+CONTROL_COMMANDS = ("reset", "switch", "flush")	# Control commands run by the monitor between journal lines
+CONTROL_TIMEOUT = 30	# Seconds a control command waits for the monitor to run it
 WARN_NOKILLS = 5	# Minutes before warning of no kills at session start
 WARN_COOLDOWN = 15	# Cooldown in minutes after a kill rate warning (doubled each time thereafter)
+KILLRATE_ALPHA = 0.2	# Weight of the latest kill interval in the kill rate model
+KILLRATE_MINKILLS = 5	# Kill intervals needed before the kill rate model will warn
+KILLRATE_REARM = 5	# Kills needed after a kill rate model warning before it can warn again
+BACKTEST_SENSITIVITIES = (1.5, 2, 2.5, 3, 4, 5)
 UNKNOWN = "[Unknown]"
-REG_JOURNAL = r"^Journal\.\d{4}-\d{2}-\d{2}T\d{6}\.\d{2}\.log$"
+REG_JOURNAL = r"^Journal\.\d{4}-\d{2}-\d{2}T\d{6}\.\d{2}\.log(?:\.gz|\.zst)?$"
+JOURNAL_ARCHIVES = (".gz", ".zst")
+ZSTD_LEVEL = 10
+REG_ANSI = r"\x1b\[[0-9;]*m"
 REG_WEBHOOK = r"^https:\/\/(?:canary\.|ptb\.)?discord(?:app)?\.com\/api\/webhooks\/\d+\/[A-z0-9_-]+$"
 SHIPS_EASY = ["adder", "asp", "asp_scout", "cobramkiii", "cobramkiv", "diamondback", "diamondbackxl", "eagle", "empire_courier", "empire_eagle", "krait_light", "sidewinder", "viper", "viper_mkiv"]
 SHIPS_HARD = ["typex", "typex_2", "typex_3", "anaconda", "federation_dropship_mkii", "federation_dropship", "federation_gunship", "ferdelance", "empire_trader", "krait_mkii", "python", "vulture", "type9_military"]
 BAIT_MESSAGES = ["$Pirate_ThreatTooHigh", "$Pirate_NotEnoughCargo", "$Pirate_OnNoCargoFound"]
-LOGLEVEL_DEFAULTS = {"ScanEasy": 1, "ScanHard": 2, "KillEasy": 2, "KillHard": 2, "FighterHull": 2, "FighterDown": 3, "ShipShields": 3, "ShipHull": 3, "Died": 3, "CargoLost": 3, "BaitValueLow": 2, "SecurityScan": 2, "SecurityAttack": 3, "FuelLow": 2, "FuelCritical": 3, "FuelReport": 1, "Missions": 2, "MissionsAll": 3, "Merits": 0, "SummaryKills": 2, "SummaryBounties": 2, "SummaryMerits": 2, "NoKills": 3, "KillRate": 3}
+CONFIG_TYPES = {("Settings", "UseUTC"): bool, ("Settings", "WarnKillRate"): (int, float), ("Settings", "WarnNoKills"): (int, float), ("Settings", "BountyFaction"): bool, ("Settings", "BountyValue"): bool, ("Settings", "ExtendedStats"): bool, ("Settings", "DynamicTitle"): bool, ("Settings", "ShowCMDR"): bool, ("Settings", "StaleSensitivity"): (int, float), ("Settings", "ControlSocket"): str, ("Discord", "WebhookURL"): str, ("Discord", "ForumChannel"): bool, ("Discord", "ThreadCmdrNames"): bool, ("Discord", "UserID"): int, ("Discord", "Timestamp"): bool, ("Discord", "Identity"): bool, ("Discord", "Webhooks"): dict, ("Discord", "Routes"): dict}
+LOGLEVEL_DEFAULTS = {"ScanEasy": 1, "ScanHard": 2, "KillEasy": 2, "KillHard": 2, "FighterHull": 2, "FighterDown": 3, "ShipShields": 3, "ShipHull": 3, "Died": 3, "CargoLost": 3, "BaitValueLow": 2, "SecurityScan": 2, "SecurityAttack": 3, "FuelLow": 2, "FuelCritical": 3, "FuelReport": 1, "Missions": 2, "MissionsAll": 3, "Merits": 0, "SummaryKills": 2, "SummaryBounties": 2, "SummaryMerits": 2, "NoKills": 3, "KillRate": 3, "SpawnsStopped": 3}
+# Message text by type, compiled for the current settings when the config loads (colours, ShowCMDR, BountyValue etc.)
+# Fields are filled in only when an output actually shows the message, with '_t', '_n' and '_c' suffixes for time, short number and comma formatting
+MESSAGES = {
+    "ScanSecurity": ("{cmdr} {warn}Scanned security{end} ({ship})", "{cmdr} **Scanned security** ({ship})"),
+    "Scan": ("{cmdr} {col}Scan{end}: {ship}{rank}", "{cmdr} **{ship}**{hard}{rank}"),
+    "Kill": ("{cmdr} {col}Kill{end}{killcount}: {ship}{killtime}{bountyvalue}{bountyfaction}", "{cmdr} {killprefix}**{ship}{hard}{killtime}**{bountyvalue}{bountyfaction}"),
+    "SummaryKills": ("{cmdr} Session kills: {kills_c} ({killrate}/hr | {avgseconds_t}/kill){recent}", "{cmdr} **Session kills: {kills_c} ({killrate}/hr | {avgseconds_t}/kill)**{recent}"),
+    "SummaryBounties": ("{cmdr} Session {killtype}: {bounties_n} ({bountyrate_n}/hr | {avgbounty_n}/kill)", None),
+    "SummaryMerits": ("{cmdr} Session merits: {merits_c} ({meritrate_c}/hr | {avgmerits_c}/kill)", None),
+    "Fuel": ("{cmdr} {col}Fuel: {percent}% remaining{end}{fuelremain}", "{cmdr} **Fuel{level} {percent}% remaining**{fuelremain}"),
+    "ShipShields": ("{cmdr} {col}Ship shields {shields}{end}", "{cmdr} **Ship shields {shields}**"),
+    "FighterHull": ("{cmdr} {warn}Fighter hull damaged!{end} (Integrity: {health}%)", "{cmdr} **Fighter hull damaged!** (Integrity: {health}%)"),
+    "ShipHull": ("{cmdr} {bad}Ship hull damaged!{end} (Integrity: {health}%)", "{cmdr} **Ship hull damaged!** (Integrity: {health}%)"),
+    "Merits": ("{cmdr} Merits: +{merits} ({power})", None),
+}
 COMBAT_RANKS = ["Harmless", "Mostly Harmless", "Novice", "Competent", "Expert", "Master", "Dangerous", "Deadly", "Elite", "Elite I", "Elite II", "Elite III", "Elite IV", "Elite V"]
 
 class Col:
@@ -65,6 +123,65 @@ try:
 except Exception:
     pass
 
+# Command line overrides
+parser = argparse.ArgumentParser(
+    prog="ED AFK Monitor",
+    description="Live monitoring of Elite Dangerous AFK sessions to terminal and Discord")
+parser.add_argument("-p", "--profile", help="Load a specific profile for config settings")
+parser.add_argument("-j", "--journal", help="Override for path to journal folder")
+parser.add_argument("-w", "--webhook", help="Override for Discord webhook URL")
+parser.add_argument("-r", "--resetsession", action="store_true", default=None, help="Reset session stats after preloading")
+parser.add_argument("-t", "--test", action="store_true", default=None, help="Re-routes Discord messages to terminal")
+parser.add_argument("-D", "--dashboard", action="store_true", default=None, help="Show a full-screen live dashboard")
+parser.add_argument("-n", "--daemon", action="store_true", default=None, help="Run without prompts, logging JSON lines and accepting commands on a control socket")
+parser.add_argument("-d", "--debug", action="store_true", default=None, help="Print information for debugging")
+file_group = parser.add_mutually_exclusive_group()
+file_group.add_argument("-s", "--setfile", help="Set specific journal file to use")
+file_group.add_argument("-f", "--fileselect", action="store_true", default=None, help="Show list of recent journals to chose from")
+parser.add_argument("-b", "--backtest", type=int, nargs="?", const=0, metavar="JOURNALS", help="Replay recent journals (default all) to compare 'StaleSensitivity' values, then exit")
+parser.add_argument("-c", "--compact", type=int, metavar="DAYS", help="Compress journals older than DAYS in the background")
+args = parser.parse_args()
+if args.compact is not None and args.compact < 1:
+    parser.error("argument -c/--compact: DAYS must be at least 1")
+
+# Stands in for the terminal, handing on each complete line that's written
+class LineOutput(io.TextIOBase):
+    def __init__(self, stream):
+        self.stream = stream
+        self.pending = threading.local()	# Each thread's unfinished line, as print() writes the text and newline separately
+        self.lock = threading.Lock()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        *lines, self.pending.text = (getattr(self.pending, "text", "") + text).split("\n")
+        for line in lines:
+            if line.strip():
+                self.line(line)
+        return len(text)
+
+    def line(self, text):
+        pass
+
+# Daemon mode terminal, writing each line as a JSON record for the service log
+class JsonOutput(LineOutput):
+    def line(self, text):
+        self.log({"type": "console", "message": re.sub(REG_ANSI, "", text).strip()})
+
+    def log(self, record):
+        record = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds")} | record
+        with self.lock:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+    def flush(self):
+        self.stream.flush()
+
+setting_daemon = args.daemon if args.daemon is not None else False
+if setting_daemon:
+    sys.stdout = JsonOutput(sys.stdout)
+
 # Print header
 title = f"ED AFK Monitor v{VERSION} by CMDR PSIPAB"
 print(f"{Col.CYAN}{"="*len(title)}")
@@ -78,46 +195,129 @@ if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
     configfile = Path(__file__).parents[1] / "afk_monitor.toml"
 else:
     configfile = Path(__file__).parent / "afk_monitor.toml"
-if configfile.is_file():
+
+def loadconfig():
     with open(configfile, mode="rb") as f:
-        try:
-            config = tomllib.load(f)
-        except tomllib.TOMLDecodeError as e:
-            fallover(f"Config decode error: {e}")
+        return tomllib.load(f)
+
+if configfile.is_file():
+    try:
+        config = loadconfig()
+    except tomllib.TOMLDecodeError as e:
+        fallover(f"Config decode error: {e}")
+    configstamp = (configfile.stat().st_mtime_ns, configfile.stat().st_size)
 else:
     fallover("Config file not found: copy and rename afk_monitor.example.toml to afk_monitor.toml\n")
 
-# Command line overrides
-parser = argparse.ArgumentParser(
-    prog="ED AFK Monitor",
-    description="Live monitoring of Elite Dangerous AFK sessions to terminal and Discord")
-parser.add_argument("-p", "--profile", help="Load a specific profile for config settings")
-parser.add_argument("-j", "--journal", help="Override for path to journal folder")
-parser.add_argument("-w", "--webhook", help="Override for Discord webhook URL")
-parser.add_argument("-r", "--resetsession", action="store_true", default=None, help="Reset session stats after preloading")
-parser.add_argument("-t", "--test", action="store_true", default=None, help="Re-routes Discord messages to terminal")
-parser.add_argument("-d", "--debug", action="store_true", default=None, help="Print information for debugging")
-file_group = parser.add_mutually_exclusive_group()
-file_group.add_argument("-s", "--setfile", help="Set specific journal file to use")
-file_group.add_argument("-f", "--fileselect", action="store_true", default=None, help="Show list of recent journals to chose from")
-args = parser.parse_args()
+
+# Message fields worked out from the values given to logevent, on first use
+MESSAGE_FIELDS = {
+    "cmdr": lambda v: f"[{track.cmdrname}]",
+    "killtime": lambda v: f" (+{time_format(v["seconds"])})" if v["seconds"] is not None else "",
+    "bountyvalue": lambda v: f" [{num_format(v["bounty"])} cr]",
+    "bountyfaction": lambda v: f" [{factionname(v["faction"])}]",
+    "recent": lambda v: f" [Last {KILLS_RECENT}: {v["recentrate"]}/hr]" if v["recentrate"] is not None else "",
+    "fuelremain": lambda v: f" (~{time_format(v["remaining"])})" if v["remaining"] is not None else "",
+}
+MESSAGE_FORMATS = {"t": lambda value: time_format(value), "n": lambda value: num_format(value), "c": "{:,}".format}
+
+class MessageValues(dict):
+    def __missing__(self, key):
+        if key in MESSAGE_FIELDS:
+            value = MESSAGE_FIELDS[key](self)
+        else:
+            name, conversion = key.rsplit("_", 1)
+            value = MESSAGE_FORMATS[conversion](self[name])
+        self[key] = value
+        return value
+
+# Fill in the parts of each message fixed by the current settings, leaving a format method for the rest
+def compilemessages(config):
+    static = {"end": Col.END, "warn": Col.WARN, "bad": Col.BAD,
+              "cmdr": "{cmdr}" if config.showcmdr else "",
+              "killcount": " x{kills}" if config.extendedstats else "",
+              "killprefix": "x{kills} " if config.extendedstats else "",
+              "bountyvalue": "{bountyvalue}" if config.bountyvalue else "",
+              "bountyfaction": "{bountyfaction}" if config.bountyfaction else ""}
+    compiled = {}
+    for name, texts in MESSAGES.items():
+        compiled[name] = tuple(re.sub(r"\{(\w+)\}", lambda m: static.get(m[1], m[0]), text).format_map if text else None for text in texts)
+    return compiled
+
+# Settings resolved for a profile into a flat lookup, replaced as a whole when the config is reloaded
+class Config:
+    def __init__(self, config, profile=None):
+        self.profile = profile
+        self.resolved = {}
+        for source in (config, config.get(profile, {}) if profile else {}):
+            for category, settings in source.items():
+                if isinstance(settings, dict):
+                    for setting, value in settings.items():
+                        self.resolved[(category, setting)] = value
+
+        # Settings that can be changed while running
+        self.utc = self.get("Settings", "UseUTC", False)
+        self.warnkillrate = self.get("Settings", "WarnKillRate", 20)
+        self.warnnokills = self.get("Settings", "WarnNoKills", 20)
+        self.stalesensitivity = self.get("Settings", "StaleSensitivity", 3)
+        self.bountyfaction = self.get("Settings", "BountyFaction", True)
+        self.bountyvalue = self.get("Settings", "BountyValue", False)
+        self.extendedstats = self.get("Settings", "ExtendedStats", False)
+        self.dynamictitle = self.get("Settings", "DynamicTitle", True)
+        self.showcmdr = self.get("Settings", "ShowCMDR", False)
+        self.discord_webhook = args.webhook if args.webhook is not None else self.get("Discord", "WebhookURL", "")
+        self.discord_forumchannel = self.get("Discord", "ForumChannel", False)
+        self.discord_thread_cmdr_names = self.get("Discord", "ThreadCmdrNames", False)
+        self.discord_user = self.get("Discord", "UserID", 0)
+        self.discord_timestamp = self.get("Discord", "Timestamp", True)
+        self.discord_identity = self.get("Discord", "Identity", True)
+        self.discord_webhooks = {DISCORD_DEFAULT: self.discord_webhook}
+        if isinstance(self.get("Discord", "Webhooks"), dict):
+            self.discord_webhooks |= self.get("Discord", "Webhooks")
+            self.discord_webhooks[DISCORD_DEFAULT] = self.discord_webhook
+        self.discord_routes = {}
+        if isinstance(self.get("Discord", "Routes"), dict):
+            for key, names in self.get("Discord", "Routes").items():
+                self.discord_routes[key] = (names,) if isinstance(names, str) else tuple(names)
+        self.loglevel = {}
+        for level in LOGLEVEL_DEFAULTS:
+            self.loglevel[level] = self.get("LogLevels", level, LOGLEVEL_DEFAULTS[level])
+        self.messages = compilemessages(self)
+
+    def get(self, category, setting, default=None):
+        return self.resolved.get((category, setting), default)
+
+    # Settings of the wrong type that would otherwise fail while running
+    def problems(self):
+        problems = []
+        for (category, setting), expected in CONFIG_TYPES.items():
+            value = self.get(category, setting)
+            if value is not None and not isinstance(value, expected):
+                problems.append(f"{category}.{setting} has an invalid value ({value!r})")
+        for level, value in self.loglevel.items():
+            if not isinstance(value, int) or not 0 <= value <= 3:
+                problems.append(f"LogLevels.{level} must be 0-3 ({value!r})")
+        for name, webhook in self.discord_webhooks.items():
+            if not isinstance(webhook, (str, dict)):
+                problems.append(f"Discord.Webhooks.{name} must be a URL or table ({webhook!r})")
+        return problems
+
+cfg = Config(config, args.profile)
 
 # Get a setting from config
 def getconfig(category, setting, default=None):
-    if profile and config.get(profile, {}).get(category, {}).get(setting) is not None:
-        return config.get(profile, {}).get(category, {}).get(setting)
-    elif config.get(category, {}).get(setting) is not None:
-        return config.get(category, {}).get(setting)
-    else:
-        return default if default is not None else None
+    return cfg.get(category, setting, default)
 
 # Get settings from arguments
 profile = args.profile if args.profile is not None else None
 setting_fileselect = args.fileselect if args.fileselect is not None else False
 setting_journal_dir = args.journal if args.journal is not None else getconfig("Settings", "JournalFolder")
 setting_journal_file = args.setfile if args.setfile is not None else None
-discord_test = args.test if args.test is not None else DISCORD_TEST
+setting_test = args.test if args.test is not None else DISCORD_TEST
+discord_test = setting_test
 debug_mode = args.debug if args.debug is not None else DEBUG_MODE
+if setting_daemon and setting_fileselect:
+    fallover("Journal selection (--fileselect) isn't available in daemon mode, use --setfile instead")
 
 def debug(message):
     if debug_mode:
@@ -126,6 +326,38 @@ def debug(message):
 debug(f"Arguments: {args}")
 debug(f"Config: {config}")
 
+# Exponentially weighted model of kill intervals, updated once per kill
+# If kills arrive at random at the modelled rate, the chance of a gap of t seconds is exp(-t / mean),
+# so the surprise (-log10 of that chance) grows linearly and crossing the sensitivity means spawns have likely stopped
+class KillRateModel:
+    def __init__(self):
+        self.mean = None
+        self.intervals = 0
+        self.warned = False
+        self.sincewarned = 0
+
+    # Spawns come in waves, so a single kill after a warning isn't enough to warn again
+    def update(self, seconds):
+        self.mean = seconds if self.mean is None else KILLRATE_ALPHA * seconds + (1 - KILLRATE_ALPHA) * self.mean
+        self.intervals += 1
+        if self.warned:
+            self.sincewarned += 1
+            self.warned = self.sincewarned < KILLRATE_REARM
+
+    def warn(self):
+        self.warned = True
+        self.sincewarned = 0
+
+    def ready(self) -> bool:
+        return self.intervals >= KILLRATE_MINKILLS and self.mean > 0
+
+    def surprise(self, seconds) -> float:
+        return seconds / self.mean / math.log(10) if self.ready() else 0
+
+    # Seconds without a kill before a sensitivity is reached
+    def limit(self, sensitivity) -> float:
+        return sensitivity * math.log(10) * self.mean
+
 class Instance:
     def __init__(self):
         self.reset()
@@ -142,7 +374,9 @@ class Instance:
         self.baitfails = 0
         self.fuellasttime = 0
         self.fuellastremain = 0
+        self.fuelremaining = None
         self.meritstoreport = 0
+        self.killmodel = KillRateModel()
 
 class Tracking:
     def __init__(self):
@@ -150,6 +384,7 @@ class Tracking:
         self.warnednokills = None
         self.warnedkillrate = None
         self.fuelcapacity = 64
+        self.fuelpercent = None
         self.totalkills = 0
         self.totaltime = 0
         self.totalbounties = 0
@@ -163,15 +398,14 @@ class Tracking:
         self.missionredirects = 0
         self.lasteventname = None
         self.thiseventtime = None
-        self.dupeevent = ""
-        self.duperepeats = 1
-        self.dupewarn = False
         self.preloading = True
         self.cmdrname = None
         self.cmdrship = None
         self.cmdrcombatrank = None
         self.cmdrcombatprogress = None
         self.lastcheck = None
+        self.started = None	# When live monitoring began, after preloading
+        self.gameexit = None	# Newest journal when the game quit, so daemon mode can follow the next one
     
     def sessionstart(self, reset=False):
         if not self.deploytime or reset:
@@ -192,6 +426,58 @@ class Tracking:
 session = Instance()
 track = Tracking()
 
+# Open a journal as text, decompressing archived journals as a stream
+def openjournal(path):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode="rt", encoding="utf-8")
+    elif path.suffix == ".zst":
+        if not zstd_available:
+            raise OSError(f"zstandard is needed to read {path.name}")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, mode="rb"), read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    else:
+        return open(path, mode="r", encoding="utf-8")
+
+# Journals that can be read here (.zst archives need zstandard)
+def readablejournal(name) -> bool:
+    return bool(re.search(REG_JOURNAL, name)) and (zstd_available or not name.endswith(".zst"))
+
+# Compress plain journals last written more than a number of days ago, leaving the monitored and newest ones alone
+def compactjournals(days):
+    cutoff = time.time() - days * 86400
+    active = (journal_file, findjournal())	# The game may still be writing the newest journal
+    suffix = ".zst" if zstd_available else ".gz"
+    compacted = 0
+    before = after = 0
+    for entry in sorted(journal_dir.iterdir()):
+        if entry.suffix != ".log" or entry.name in active or not re.search(REG_JOURNAL, entry.name):
+            continue
+        archive = entry.with_name(entry.name + suffix)
+        partial_file = entry.with_name(entry.name + suffix + ".part")
+        try:
+            stat = entry.stat()
+            if stat.st_mtime >= cutoff:
+                continue
+            with open(entry, mode="rb") as source:
+                if suffix == ".zst":
+                    with open(partial_file, mode="wb") as target:
+                        zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(source, target)
+                else:
+                    with gzip.open(partial_file, mode="wb") as target:
+                        shutil.copyfileobj(source, target)
+            os.utime(partial_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(partial_file, archive)
+            entry.unlink()
+            compacted += 1
+            before += stat.st_size
+            after += archive.stat().st_size
+        except OSError as e:
+            warning(f"Unable to compress {entry.name}: {e}")
+            partial_file.unlink(missing_ok=True)
+    if compacted:
+        logevent(msg_term=f"Compressed {compacted} old journals ({before/1_048_576:.1f}MB to {after/1_048_576:.1f}MB)",
+                emoji="🗜️", loglevel=1)
+
 # Set journal directory
 if not setting_journal_dir:
     journal_dir = Path.home() / "Saved Games" / "Frontier Developments" / "Elite Dangerous"
@@ -202,6 +488,136 @@ if not journal_dir.is_dir():
 
 print(f"{Col.YELL}Journal folder:{Col.END} {journal_dir}")
 
+# Durations and numbers arrive as floats that rarely repeat, so only the whole values are cached
+def time_format(seconds: int) -> str:
+    if seconds is not None:
+        return formatseconds(int(seconds))
+
+@lru_cache(maxsize=CACHE_TIMES)
+def formatseconds(seconds: int) -> str:
+    h = seconds // 3600
+    m = seconds % 3600 // 60
+    s = seconds % 3600 % 60
+    if h > 0:
+        return "{:d}h{:d}m".format(h, m)
+    elif m > 0:
+        return "{:d}m{:d}s".format(m, s)
+    else:
+        return "{:d}s".format(s)
+
+def num_format(number: int) -> str:
+    if number is not None:
+        return formatnumber(int(number))
+
+@lru_cache(maxsize=CACHE_TIMES)
+def formatnumber(number: int) -> str:
+    if number >= 999_500:
+        return f"{round(number / 1_000_000, 1):g}m"
+    elif number >= 1_000:
+        return f"{round(number / 1_000):g}k"
+    else:
+        return number
+
+def clocktime(moment) -> str:
+    return datetime.strftime(moment, "%H:%M:%S")
+
+@lru_cache(maxsize=CACHE_NAMES)
+def shipname(ship, localised=None) -> str:
+    return localised if localised else ship.title()
+
+@lru_cache(maxsize=CACHE_NAMES)
+def factionname(faction) -> str:
+    return faction if len(faction) <= TRUNC_FACTION+3 else f"{faction[:TRUNC_FACTION].rstrip()}..."
+
+# Replay journals through the kill rate model to see how soon each sensitivity would have warned
+def backtest(count=0):
+    journals = sorted(entry for entry in journal_dir.iterdir() if readablejournal(entry.name))
+    journals = journals[-count:] if count else journals
+    kills = 0
+    gaps = []	# (model limit per sensitivity or None, gap seconds, ended session)
+
+    for path in journals:
+        killmodel = lastkill = eventtime = None
+        try:
+            with openjournal(path) as file:
+                for line in file:
+                    try:
+                        j = json.loads(line)
+                        eventtime = datetime.fromisoformat(j["timestamp"])
+                    except (ValueError, KeyError):
+                        continue
+                    event = j.get("event")
+                    if event in ("Bounty", "FactionKillBond"):
+                        kills += 1
+                        if lastkill and killmodel:
+                            seconds = (eventtime - lastkill).total_seconds()
+                            if killmodel.ready():
+                                gaps.append(([killmodel.limit(x) for x in BACKTEST_SENSITIVITIES], seconds, False))
+                            killmodel.update(seconds)
+                        else:
+                            killmodel = KillRateModel()
+                        lastkill = eventtime
+                    elif (event in ("SupercruiseEntry", "FSDJump", "Shutdown", "SupercruiseDestinationDrop")
+                            or (event == "Music" and j.get("MusicTrack") == "MainMenu")):
+                        if lastkill and killmodel.ready():
+                            gaps.append(([killmodel.limit(x) for x in BACKTEST_SENSITIVITIES], (eventtime - lastkill).total_seconds(), True))
+                        killmodel = lastkill = None
+            if lastkill and killmodel.ready():
+                gaps.append(([killmodel.limit(x) for x in BACKTEST_SENSITIVITIES], (eventtime - lastkill).total_seconds(), True))
+        except (OSError, EOFError) as e:
+            print(f"{Col.WHITE}Warning:{Col.END} Unable to read {path.name}: {e}")
+
+    hours = sum(gap for limits, gap, ended in gaps) / 3600
+    endings = sum(1 for limits, gap, ended in gaps if ended)
+    print(f"Replayed {len(journals)} journals: {kills:,} kills, {hours:.1f} hours of modelled sessions, {endings} session endings\n")
+    if not gaps:
+        return
+
+    # Warnings the live checks would give for a threshold, with the shared cooldown and re-arming after kills
+    def replay(threshold, rearm):
+        false = 0
+        caught = []
+        armed = True
+        kills = clock = 0
+        lastwarn = None
+        cooldown = WARN_COOLDOWN * 60
+        for limits, gap, ended in gaps:
+            limit = threshold(limits)
+            if armed and gap >= limit and (lastwarn is None or clock + limit - lastwarn >= cooldown):
+                if lastwarn is not None:
+                    cooldown *= 2
+                lastwarn = clock + limit
+                armed = not rearm
+                kills = 0
+                if ended:
+                    caught.append(limit)
+                else:
+                    false += 1
+            clock += gap
+            if ended:
+                armed = True
+                kills = 0
+                lastwarn = None
+            else:
+                kills += 1
+                armed = armed or kills >= rearm
+        return false, caught
+
+    print(f"{Col.YELL}Sensitivity  False alarms  Per hour  Endings caught  Avg. warning after last kill{Col.END}")
+    rows = []
+    for i, sensitivity in enumerate(BACKTEST_SENSITIVITIES):
+        false, caught = replay(lambda limits: limits[i], KILLRATE_REARM)
+        current = " (current)" if sensitivity == cfg.stalesensitivity else ""
+        rows.append((f"{sensitivity:g}{current}", false, len(caught), time_format(sum(caught) / len(caught)) if caught else "-"))
+    false, caught = replay(lambda limits: cfg.warnnokills * 60, 0)
+    rows.append(("WarnNoKills", false, len(caught), time_format(cfg.warnnokills * 60)))
+    for name, false, caught, delay in rows:
+        print(f"{name:<11}  {false:>12}  {false / hours if hours else 0:>8.2f}  {f"{caught}/{endings}":>14}  {delay}")
+
+if args.backtest is not None:
+    backtest(args.backtest)
+    sys.exit()
+
 # Set journal file
 if not setting_journal_file:
     journals = []
@@ -209,9 +625,11 @@ if not setting_journal_file:
 
     # Get recent journals, newest first
     for entry in sorted(journal_dir.iterdir(), reverse=True):
-        if entry.is_file() and bool(re.search(REG_JOURNAL, entry.name)):
+        if entry.is_file() and readablejournal(entry.name):
             if not setting_fileselect:
-                # Just the latest journal
+                # Just the latest live journal (archives only load when chosen)
+                if entry.name.endswith(JOURNAL_ARCHIVES):
+                    continue
                 journal_file = entry.name
                 break
             else:
@@ -231,15 +649,18 @@ if not setting_journal_file:
         commanders = []
         for i, filename in enumerate(journals, start=1):
             commander = None
-            with open(Path(journal_dir / filename), mode="r", encoding="utf-8") as file:
-                for line in file:
-                    try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError as e:
-                        print(f"[Fileselect] JSON error in {filename}: {e}")
-                    if entry["event"] == "Commander":
-                        commander =  entry["Name"]
-                        break
+            try:
+                with openjournal(journal_dir / filename) as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError as e:
+                            print(f"[Fileselect] JSON error in {filename}: {e}")
+                        if entry["event"] == "Commander":
+                            commander =  entry["Name"]
+                            break
+            except (OSError, EOFError) as e:
+                print(f"[Fileselect] Unable to read {filename}: {e}")
 
             num = f"{i:>{len(str(len(journals)))}}"
             print(f"{num} | {filename} | CMDR {commander if commander else UNKNOWN}")
@@ -266,21 +687,23 @@ elif setting_journal_file:
     journal_file = setting_journal_file if bool(re.search(REG_JOURNAL, setting_journal_file)) else None
     if not journal_file or not (journal_dir / journal_file).is_file():
         fallover(f"Journal file '{setting_journal_file}' invalid or not found")
+    elif not readablejournal(journal_file):
+        fallover(f"Journal file '{setting_journal_file}' needs zstandard to be installed")
 
 print(f"{Col.YELL}Journal file:{Col.END} {journal_file}")
 
 # Get commander name if not already known
 if not track.cmdrname:
     try:
-        with open(Path(journal_dir / journal_file), mode="r", encoding="utf-8") as file:
+        with openjournal(journal_dir / journal_file) as file:
             for line in file:
                 entry = json.loads(line)
                 if entry["event"] == "Commander":
                     track.cmdrname = entry["Name"]
                     break
             
-            # If we *still* don't have a commander name wait for it
-            if not track.cmdrname:
+            # If we *still* don't have a commander name wait for it (archived journals won't get one)
+            if not track.cmdrname and not journal_file.endswith(JOURNAL_ARCHIVES):
                 print("Waiting for game load... (Press Ctrl+C to stop)")
                 file.seek(0, 2)
                 while True:
@@ -296,6 +719,8 @@ if not track.cmdrname:
                         break
     except json.JSONDecodeError as e:
         print(f"[CMDR Name] JSON error in {journal_file}: {e}")
+    except OSError as e:
+        fallover(f"Unable to read journal {journal_file}: {e}")
     except(KeyboardInterrupt):
         fallover("Quitting...")
 
@@ -315,96 +740,770 @@ print(f"{Col.YELL}Config profile:{Col.END} {profile if profile else "Default"}{c
 if profile: debug(f"Profile '{profile}': {config[profile]}")
 
 # Get settings from config
-setting_utc = getconfig("Settings", "UseUTC", False)
-setting_warnkillrate = getconfig("Settings", "WarnKillRate", 20)
-setting_warnnokills = getconfig("Settings", "WarnNoKills", 20)
-setting_bountyfaction = getconfig("Settings", "BountyFaction", True)
-setting_bountyvalue = getconfig("Settings", "BountyValue", False)
-setting_extendedstats = getconfig("Settings", "ExtendedStats", False)
-setting_dynamictitle = getconfig("Settings", "DynamicTitle", True)
-discord_webhook = args.webhook if args.webhook is not None else getconfig("Discord", "WebhookURL", "")
-discord_forumchannel = getconfig("Discord", "ForumChannel", False)
-discord_thread_cmdr_names = getconfig("Discord", "ThreadCmdrNames", False)
-discord_user = getconfig("Discord", "UserID", 0)
-discord_timestamp = getconfig("Discord", "Timestamp", True)
-discord_identity = getconfig("Discord", "Identity", True)
-setting_showcmdr = getconfig("Settings", "ShowCMDR", False)
-loglevel = {}
-for level in LOGLEVEL_DEFAULTS:
-    loglevel[level] = getconfig("LogLevels", level, LOGLEVEL_DEFAULTS[level])
-
-debug(f"Log levels: {loglevel}")
+cfg = Config(config, profile)
+for problem in cfg.problems():
+    print(f"{Col.WHITE}Warning:{Col.END} Config {problem}")
+setting_logfile = getconfig("Settings", "LogFile", "")
+setting_dashboard = args.dashboard if args.dashboard is not None else getconfig("Settings", "Dashboard", False)
+setting_webserver = getconfig("Settings", "WebServer", False)
+setting_webhost = getconfig("Settings", "WebHost", "127.0.0.1")
+setting_webport = getconfig("Settings", "WebPort", 8050)
+setting_controlsocket = Path(getconfig("Settings", "ControlSocket", "") or configfile.parent / CONTROL_SOCKET)
+
+debug(f"Log levels: {cfg.loglevel}")
 print("\nStarting... (Press Ctrl+C to stop)\n")
 
-# Check webhook appears valid before starting
-if discord_enabled and re.search(REG_WEBHOOK, discord_webhook):
-    webhook = DiscordWebhook(url=discord_webhook)
-    if discord_identity:
-        webhook.username = "ED AFK Monitor"
-        webhook.avatar_url = "https://cdn.discordapp.com/attachments/1339930614064877570/1354083225923883038/t10.png"
-    if discord_forumchannel:
-        journal_start = datetime.fromisoformat(journal_file[8:-7])
-        journal_start = datetime.strftime(journal_start, "%Y-%m-%d %H:%M:%S")
-        if discord_thread_cmdr_names:
-            webhook.thread_name = f"{track.cmdrname} {journal_start}"
+# A single logged event, published once and handed to every subscribed output
+# Text and times are only rendered when the first output asks for them, so unwanted messages cost next to nothing
+class Alert:
+    __slots__ = ("term", "discord", "message", "values", "emoji", "stamp", "local", "localtime", "loglevel", "event", "kind")
+
+    def __init__(self, msg_term=None, msg_discord=None, emoji="", stamp=None, loglevel=2, event=None, kind=None, message=None, values=None, local=False):
+        self.term = msg_term
+        self.discord = msg_discord
+        self.message = message
+        self.values = values
+        self.emoji = emoji
+        self.stamp = stamp
+        self.local = local
+        self.localtime = None
+        self.loglevel = loglevel
+        self.event = event
+        self.kind = kind
+
+    @property
+    def msg_term(self):
+        if self.term is None:
+            self.term = self.message[0](self.values)
+        return self.term
+
+    @property
+    def msg_discord(self):
+        if self.discord is None and self.message and self.message[1]:
+            self.discord = self.message[1](self.values)
+        return self.discord
+
+    @property
+    def time(self):
+        if self.localtime is None:
+            self.localtime = self.stamp.astimezone() if self.local else self.stamp
+        return self.localtime
+
+    @property
+    def logtime(self):
+        return clocktime(self.time)
+
+# Base output with its own queue and worker thread so a slow or broken output can't hold up the others
+class Sink:
+    name = "Output"
+    lossless = False	# Local outputs hold up the sender rather than drop anything
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=SINK_QUEUE)
+        self.dropped = 0
+        self.lasterror = None
+        self.finishing = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+
+    # Whether this output is interested in an alert (checked before queueing)
+    def wants(self, alert) -> bool:
+        return True
+
+    # Build the output for an alert, returning None to skip it
+    def format(self, alert):
+        return alert.msg_term
+
+    def send(self, message):
+        pass
+
+    def put(self, item):
+        if self.lossless:
+            self.queue.put(item)
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                print(f"{Col.WARN}Warning:{Col.END} {self.name} output is falling behind, dropping messages")
+
+    # Run a function on this output's thread, in order with its alerts
+    def call(self, func, *args):
+        self.put(partial(func, *args))
+
+    # Ask the thread to finish once its queue is empty, without waiting on a full queue
+    def stop(self):
+        self.finishing.set()
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    self.close()
+                    break
+                elif isinstance(item, Alert):
+                    message = self.format(item)
+                    if message is not None:
+                        self.send(message)
+                else:
+                    item()
+            except Exception as e:
+                if repr(e) != self.lasterror:
+                    print(f"{Col.WARN}Warning:{Col.END} {self.name} output error: {e}")
+                    self.lasterror = repr(e)
+            finally:
+                self.queue.task_done()
+            if self.finishing.is_set() and self.queue.empty():
+                self.close()
+                break
+
+    def close(self):
+        pass
+
+class TerminalSink(Sink):
+    name = "Terminal"
+    lossless = True
+
+    def wants(self, alert):
+        return alert.loglevel > 0 and (not discord_test or alert.kind == "Warning")
+
+    def format(self, alert):
+        return f"[{alert.logtime}]{alert.emoji} {alert.msg_term}"
+
+    def send(self, message):
+        print(message)
+
+# Daemon mode output of one JSON record per message
+class JsonSink(Sink):
+    name = "Log"
+    lossless = True
+
+    def wants(self, alert):
+        return alert.loglevel > 0 and (not discord_test or alert.kind == "Warning")
+
+    def format(self, alert):
+        return {"time": alert.stamp.astimezone(timezone.utc).isoformat(timespec="seconds"), "type": "event", "kind": alert.kind, "level": alert.loglevel,
+                "emoji": alert.emoji, "message": re.sub(REG_ANSI, "", alert.msg_term).strip()}
+
+    def send(self, record):
+        sys.stdout.log(record)
+
+class FileSink(Sink):
+    name = "Log file"
+    lossless = True
+
+    def __init__(self, path):
+        super().__init__()
+        self.file = open(path, mode="a", encoding="utf-8")
+
+    def wants(self, alert):
+        return alert.loglevel > 0
+
+    def format(self, alert):
+        message = re.sub(REG_ANSI, "", alert.msg_term)
+        return f"[{datetime.strftime(alert.time, "%Y-%m-%d %H:%M:%S")}]{alert.emoji} {message.strip()}\n"
+
+    def send(self, message):
+        self.file.write(message)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class DiscordSink(Sink):
+    def __init__(self, webhook, url, forumchannel=False):
+        self.name = "Discord" if webhook == DISCORD_DEFAULT else f"Discord ({webhook})"
+        super().__init__()
+        self.webhook = webhook
+        self.url = url
+        self.forumchannel = forumchannel
+        self.dupeevent = ""
+        self.duperepeats = 1
+        self.dupewarn = False
+        self.configure()
+        self.messageid = None
+        self.newthread()
+
+    # Forum channel posts go to a thread named for the journal (a new one after switching journals)
+    def newthread(self):
+        self.threadname = None
+        self.threadid = None
+        if self.forumchannel:
+            journal_start = datetime.fromisoformat(journal_file.split(".")[1])
+            journal_start = datetime.strftime(journal_start, "%Y-%m-%d %H:%M:%S")
+            if cfg.discord_thread_cmdr_names:
+                self.threadname = f"{track.cmdrname} {journal_start}"
+            else:
+                self.threadname = journal_start
+            #debug(f"threadname: {self.threadname}")
+
+    # Test mode prints to the terminal, so nothing should be dropped
+    @property
+    def lossless(self):
+        return discord_test
+
+    # Pick up settings from the current config (run on this output's thread after a reload)
+    def configure(self):
+        self.user = cfg.discord_user
+        self.timestamp = cfg.discord_timestamp
+        self.payload = {}
+        if cfg.discord_identity:
+            self.payload["username"] = "ED AFK Monitor"
+            self.payload["avatar_url"] = "https://cdn.discordapp.com/attachments/1339930614064877570/1354083225923883038/t10.png"
+
+    def wants(self, alert):
+        return alert.loglevel > 1 and self.webhook in discordroute(alert)
+
+    def format(self, alert):
+        if alert.event is not None and self.dupeevent == alert.event:
+            self.duperepeats += 1
         else:
-            webhook.thread_name = journal_start
-        #debug(f"webhook.thread_name: {webhook.thread_name}")
-elif discord_enabled:
-    discord_enabled = False
-    discord_test = False
-    print(f"{Col.WHITE}Info:{Col.END} Discord webhook missing or invalid - operating with terminal output only\n")
-
-# Send a webhook message or (don"t) die trying
-def discordsend(message=""):
-    if discord_enabled and message and not discord_test:
+            self.duperepeats = 1
+            self.dupewarn = False
+        self.dupeevent = alert.event
+        discord_message = alert.msg_discord if alert.msg_discord else f"**{alert.msg_term}**"
+        ping = f" <@{self.user}>" if alert.loglevel > 2 and self.duperepeats == 1 else ""
+        logtime = f" {{{alert.logtime}}}" if self.timestamp else ""
+        if self.duperepeats <= DUPE_MAX:
+            return f"{alert.emoji} {discord_message}{logtime}{ping}"
+        elif not self.dupewarn:
+            self.dupewarn = True
+            return f"⏸️ **Suppressing further duplicate messages**{logtime}"
+
+    # Post to the webhook over the shared connection pool, waiting out any rate limit
+    def request(self, method, url, content):
+        payload = dict(self.payload, content=content)
+        params = {"wait": "true"}
+        if self.threadid:
+            params["thread_id"] = self.threadid
+        elif self.threadname:
+            payload["thread_name"] = self.threadname
+        for attempt in range(DISCORD_RETRIES):
+            response = discord_session.request(method, url, json=payload, params=params, timeout=DISCORD_TIMEOUT)
+            if response.status_code != 429:
+                break
+            time.sleep(float(response.json().get("retry_after", 1)) + 0.15)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    # Send a webhook message or (don't) die trying
+    def send(self, message):
+        if discord_test:
+            print(f"{Col.WHITE}{self.name.upper()}:{Col.END} {message}")
+            return
         try:
-            webhook.content = message
-            webhook.execute()
-            if discord_forumchannel and webhook.thread_name and not webhook.thread_id:
-                webhook.thread_name = None
-                webhook.thread_id = webhook.id
-                #debug(f"webhook.thread_id: {webhook.thread_id}")
+            reply = self.request("POST", self.url, message)
+            self.messageid = reply.get("id")
+            if self.forumchannel and not self.threadid:
+                self.threadid = reply.get("channel_id")
+                #debug(f"threadid: {self.threadid}")
         except Exception as e:
-            print(f"{Col.WHITE}Discord:{Col.END} Webhook send error: {e}")
-    elif discord_enabled and message and discord_test:
-        print(f"{Col.WHITE}DISCORD:{Col.END} {message}")
+            print(f"{Col.WHITE}{self.name}:{Col.END} Webhook send error: {e}")
+
+    # Startup banner, edited to add a ping once the forum thread exists
+    def announce(self, message):
+        self.send(message)
+        if self.forumchannel and self.messageid and not discord_test:
+            self.request("PATCH", f"{self.url}/messages/{self.messageid}", f"{message} <@{self.user}>")
+
+# Names of the webhooks an alert should go to, by event type first and then log level
+def discordroute(alert):
+    return cfg.discord_routes.get(alert.kind) or cfg.discord_routes.get(str(alert.loglevel)) or (DISCORD_DEFAULT,)
+
+# Full-screen live view, redrawn on its own thread and only where lines have changed
+# Anything printed while the dashboard is up joins its recent events instead of landing mid-screen
+class DashboardOutput(LineOutput):
+    def __init__(self, stream, dashboard):
+        super().__init__(stream)
+        self.dashboard = dashboard
+
+    def line(self, text):
+        self.dashboard.events.append(f"[{datetime.strftime(datetime.now(), "%H:%M:%S")}] {text.strip()}")
+
+class DashboardSink(Sink):
+    name = "Dashboard"
+    lossless = True
+
+    def __init__(self):
+        super().__init__()
+        self.events = deque(maxlen=DASH_EVENTS)
+        self.frame = []
+        self.size = None
+        self.stream = sys.stdout
+        sys.stdout = DashboardOutput(self.stream, self)
+        self.stopping = threading.Event()
+        self.renderer = threading.Thread(target=self.render, name="Dashboard render", daemon=True)
+        self.renderer.start()
+
+    def wants(self, alert):
+        return alert.loglevel > 0
+
+    def format(self, alert):
+        return f"[{alert.logtime}]{alert.emoji} {alert.msg_term}"
+
+    def send(self, message):
+        self.events.append(message)
+
+    def row(self, label, value):
+        return f" {Col.YELL}{label:<11}{Col.END}{value}"
+
+    # Build the full screen as a list of lines
+    def screen(self, height):
+        status = sessionstatus()
+        lines = [f" {Col.CYAN}ED AFK Monitor v{VERSION}{Col.END} | CMDR {status["cmdr"]} | {status["journal"]}", ""]
+        if status["deployed"]:
+            lastkill = f" (last {time_format(status["sincekill"])} ago)" if status["kills"] else ""
+            lines.append(self.row("Session", time_format(status["sessiontime"])))
+            lines.append(self.row("Kills", f"{status["kills"]:,}{lastkill}"))
+        else:
+            lines.append(self.row("Session", "Not deployed"))
+            lines.append(self.row("Kills", f"{status["kills"]:,}"))
+        killrate = f"{status["killrate"]}/h" if status["killrate"] is not None else "-/h"
+        if status["killraterecent"] is not None:
+            killrate += f" [Last {KILLS_RECENT}: {status["killraterecent"]}/h]"
+        lines.append(self.row("Kill rate", killrate))
+        bountyrate = f" ({num_format(status["bountyrate"])}/h)" if status["bountyrate"] is not None else ""
+        lines.append(self.row(status["killtype"].title(), f"{num_format(status["bounties"])}{bountyrate}"))
+        if status["merits"]:
+            lines.append(self.row("Merits", f"{status["merits"]:,}"))
+        if status["missionsactive"]:
+            filled = round(DASH_BAR * status["missions"] / status["missionsactive"])
+            lines.append(self.row("Missions", f"{"█" * filled}{"░" * (DASH_BAR - filled)} {status["missions"]}/{status["missionsactive"]}"))
+        else:
+            lines.append(self.row("Missions", "None active"))
+        if status["fuel"] is not None:
+            fuelremaining = f" (~{time_format(status["fuelremaining"])})" if status["fuelremaining"] is not None else ""
+            col = Col.BAD if status["fuel"] < FUEL_CRIT * 100 else Col.WARN if status["fuel"] < FUEL_LOW * 100 else ""
+            lines.append(self.row("Fuel", f"{col}{status["fuel"]}%{Col.END}{fuelremaining}"))
+        lines.append("")
+        lines.append(f" {Col.WHITE}Recent events{Col.END}")
+        events = max(0, height - len(lines))
+        lines.extend(list(self.events)[-events:] if events else [])
+        return lines
+
+    # Write only the lines that differ from the last frame
+    def draw(self):
+        size = shutil.get_terminal_size()
+        lines = self.screen(size.lines)
+        output = []
+        if size != self.size:
+            self.size = size
+            self.frame = []
+            output.append("\x1b[2J")
+        for row, line in enumerate(lines):
+            if row >= len(self.frame) or self.frame[row] != line:
+                output.append(f"\x1b[{row+1};1H{line}\x1b[K")
+        for row in range(len(lines), len(self.frame)):
+            output.append(f"\x1b[{row+1};1H\x1b[K")
+        self.frame = lines
+        if output:
+            self.stream.write("".join(output))
+            self.stream.flush()
+
+    def render(self):
+        # Alternate screen, hidden cursor and no line wrapping (long lines are clipped)
+        self.stream.write("\x1b[?1049h\x1b[?25l\x1b[?7l")
+        while not self.stopping.wait(1 / DASH_FPS):
+            try:
+                self.draw()
+            except Exception as e:
+                self.lasterror = repr(e)
+
+    # Restore the terminal and leave the recent events behind on it
+    def close(self):
+        self.stopping.set()
+        self.renderer.join()
+        sys.stdout = self.stream
+        sys.stdout.write("\x1b[?7h\x1b[?25h\x1b[?1049l")
+        for message in self.events:
+            print(message)
+
+# Status page served by the web dashboard
+WEB_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>ED AFK Monitor</title>
+<style>
+body { background: #111; color: #ddd; font: 15px/1.4 system-ui, sans-serif; margin: 0 auto; max-width: 50em; padding: 1em; }
+h1 { color: #5ce1e6; font-size: 1.3em; margin: 0 0 .5em; }
+table { border-collapse: collapse; margin-bottom: 1em; }
+th { color: #f9e46f; font-weight: normal; padding-right: 1.5em; text-align: left; }
+#events div { border-top: 1px solid #222; font-family: monospace; padding: .2em 0; }
+.l3 { color: #ff8c8c; } .offline { color: #888; }
+</style>
+</head>
+<body>
+<h1>ED AFK Monitor <span id="state" class="offline">(connecting)</span></h1>
+<table id="status"></table>
+<div id="events"></div>
+<script>
+const fields = [["CMDR", s => s.cmdr], ["Session", s => s.deployed ? duration(s.sessiontime) : "Not deployed"],
+    ["Kills", s => s.kills + (s.sincekill !== null && s.kills ? ` (last ${duration(s.sincekill)} ago)` : "")],
+    ["Kill rate", s => (s.killrate ?? "-") + "/h" + (s.killraterecent !== null ? ` [recent: ${s.killraterecent}/h]` : "")],
+    [s => s.killtype[0].toUpperCase() + s.killtype.slice(1), s => s.bounties.toLocaleString() + (s.bountyrate !== null ? ` (${s.bountyrate.toLocaleString()}/h)` : "")],
+    ["Missions", s => s.missionsactive ? `${s.missions}/${s.missionsactive}` : "None active"],
+    ["Fuel", s => s.fuel === null ? "-" : s.fuel + "%" + (s.fuelremaining !== null ? ` (~${duration(s.fuelremaining)})` : "")]];
+function duration(seconds) {
+    seconds = Math.round(seconds);
+    const h = Math.floor(seconds / 3600), m = Math.floor(seconds % 3600 / 60);
+    return h ? `${h}h${m}m` : m ? `${m}m${seconds % 60}s` : `${seconds}s`;
+}
+const source = new EventSource("events");
+source.onopen = () => { state.textContent = ""; document.getElementById("events").replaceChildren(); };
+source.onerror = () => { state.textContent = "(offline)"; };
+source.addEventListener("status", e => {
+    const s = JSON.parse(e.data);
+    document.getElementById("status").innerHTML = "";
+    for (const [label, value] of fields) {
+        const row = document.getElementById("status").insertRow();
+        row.insertCell().outerHTML = `<th>${typeof label === "function" ? label(s) : label}</th>`;
+        row.insertCell().textContent = value(s);
+    }
+});
+source.addEventListener("alert", e => {
+    const a = JSON.parse(e.data), div = document.createElement("div");
+    div.textContent = `[${a.time}] ${a.emoji} ${a.message}`;
+    if (a.level > 2) div.className = "l3";
+    document.getElementById("events").prepend(div);
+    while (document.getElementById("events").childElementCount > MAXEVENTS) document.getElementById("events").lastChild.remove();
+});
+</script>
+</body>
+</html>
+""".replace("MAXEVENTS", str(WEB_EVENTS))
+
+class WebHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        sink = self.server.sink
+        if self.path == "/":
+            self.reply(200, "text/html; charset=utf-8", WEB_PAGE.encode())
+        elif self.path == "/status":
+            self.reply(200, "application/json", json.dumps(sessionstatus()).encode())
+        elif self.path == "/events":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            viewer = queue.Queue()
+            snapshot = sink.addviewer(viewer)
+            try:
+                self.wfile.write(snapshot)
+                self.wfile.flush()
+                while True:
+                    try:
+                        message = viewer.get(timeout=WEB_KEEPALIVE)
+                    except queue.Empty:
+                        message = b": keepalive\n\n"
+                    if message is None:
+                        break
+                    self.wfile.write(message)
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                sink.removeviewer(viewer)
+        else:
+            self.reply(404, "text/plain", b"Not found")
+
+    def reply(self, code, contenttype, body):
+        self.send_response(code)
+        self.send_header("Content-Type", contenttype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Local web dashboard that serialises each update once and pushes it to every viewer via Server-Sent Events
+class WebSink(Sink):
+    name = "Web"
+
+    def __init__(self, host, port):
+        super().__init__()
+        self.viewers = set()
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=WEB_EVENTS)
+        self.status = None
+        self.stopping = threading.Event()
+        self.server = ThreadingHTTPServer((host, port), WebHandler)
+        self.server.daemon_threads = True
+        self.server.sink = self
+        threading.Thread(target=self.server.serve_forever, name="Web server", daemon=True).start()
+        threading.Thread(target=self.tick, name="Web status", daemon=True).start()
+
+    def wants(self, alert):
+        return alert.loglevel > 0
+
+    def format(self, alert):
+        data = {"time": alert.logtime, "emoji": alert.emoji, "message": re.sub(REG_ANSI, "", alert.msg_term).strip(),
+                "level": alert.loglevel, "kind": alert.kind}
+        return f"event: alert\ndata: {json.dumps(data)}\n\n".encode()
+
+    def send(self, message):
+        with self.lock:
+            self.recent.append(message)
+            self.broadcast(message)
+
+    # Hand the same serialised message to every viewer, dropping any that can't keep up
+    def broadcast(self, message):
+        for viewer in list(self.viewers):
+            if viewer.qsize() < SINK_QUEUE:
+                viewer.put_nowait(message)
+            else:
+                self.viewers.discard(viewer)
+                viewer.put_nowait(None)
+
+    def statusmessage(self):
+        return f"event: status\ndata: {json.dumps(sessionstatus())}\n\n".encode()
+
+    # Register a viewer and return the current session snapshot for it
+    def addviewer(self, viewer):
+        status = self.statusmessage()
+        with self.lock:
+            self.viewers.add(viewer)
+            return status + b"".join(self.recent)
+
+    def removeviewer(self, viewer):
+        with self.lock:
+            self.viewers.discard(viewer)
+
+    # Push counter updates when they change, but only while someone is watching
+    def tick(self):
+        while not self.stopping.wait(WEB_STATUS):
+            if self.viewers:
+                try:
+                    status = self.statusmessage()
+                except Exception as e:
+                    self.lasterror = repr(e)
+                    continue
+                if status != self.status:
+                    self.status = status
+                    with self.lock:
+                        self.broadcast(status)
+
+    def close(self):
+        self.stopping.set()
+        with self.lock:
+            self.broadcast(None)
+        self.server.shutdown()
+        self.server.server_close()
+
+# Hands each alert to the outputs that want it without waiting on any of them
+class EventBus:
+    def __init__(self):
+        self.sinks = []
+
+    def subscribe(self, sink):
+        sink.thread.start()
+        self.sinks = self.sinks + [sink]
+        return sink
+
+    # Stop sending to an output, letting it finish what it already has queued
+    def unsubscribe(self, sink):
+        self.sinks = [s for s in self.sinks if s is not sink]
+        sink.stop()
+
+    def publish(self, alert):
+        for sink in self.sinks:
+            if sink.wants(alert):
+                sink.put(alert)
+
+    # Wait for every output to catch up, or just the local ones that never drop anything
+    def flush(self, localonly=False):
+        for sink in self.sinks:
+            if sink.lossless or not localonly:
+                sink.queue.join()
+
+    def close(self):
+        sinks, self.sinks = self.sinks, []
+        for sink in sinks:
+            sink.stop()
+        for sink in sinks:
+            sink.thread.join(SINK_CLOSE)
+
+bus = EventBus()
+if setting_dashboard and setting_daemon:
+    setting_dashboard = False
+elif setting_dashboard and not sys.stdout.isatty():
+    setting_dashboard = False
+    print(f"{Col.WHITE}Info:{Col.END} Dashboard needs an interactive terminal - using standard output\n")
+if setting_daemon:
+    bus.subscribe(JsonSink())
+elif setting_dashboard:
+    bus.subscribe(DashboardSink())
+else:
+    bus.subscribe(TerminalSink())
+if setting_logfile:
+    try:
+        bus.subscribe(FileSink(Path(setting_logfile)))
+    except OSError as e:
+        print(f"{Col.WHITE}Warning:{Col.END} Unable to open log file: {e}\n")
+if setting_webserver:
+    try:
+        bus.subscribe(WebSink(setting_webhost, setting_webport))
+        print(f"{Col.YELL}Web dashboard:{Col.END} http://{setting_webhost}:{setting_webport}/\n")
+    except OSError as e:
+        print(f"{Col.WHITE}Warning:{Col.END} Unable to start web dashboard: {e}\n")
+
+# Local control socket for daemon mode, answering each command line with a line of JSON
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            command, _, argument = line.decode("utf-8", "replace").strip().partition(" ")
+            if not command:
+                continue
+            if command == "status":
+                reply = {"ok": True, "status": sessionstatus()}
+            elif command in CONTROL_COMMANDS:
+                result = queue.Queue(maxsize=1)
+                claim = threading.Lock()	# Held by whichever of the monitor (running it) or this handler (cancelling it) gets there first
+                controlqueue.put((command, argument.strip(), result, claim))
+                try:
+                    reply = result.get(timeout=CONTROL_TIMEOUT)
+                except queue.Empty:
+                    if claim.acquire(blocking=False):
+                        reply = {"ok": False, "error": "Monitor busy, try again"}
+                    else:
+                        reply = result.get()
+            else:
+                reply = {"ok": False, "error": f"Unknown command '{command}' (status, reset, switch [journal], flush)"}
+            self.wfile.write(f"{json.dumps(reply)}\n".encode("utf-8"))
+
+controlqueue = queue.Queue()
+control = None
+if setting_daemon:
+    if hasattr(socketserver, "ThreadingUnixStreamServer"):
+        try:
+            # Only clear away a socket left behind by an instance that has stopped
+            if setting_controlsocket.is_socket():
+                with socket.socket(socket.AF_UNIX) as probe:
+                    try:
+                        probe.connect(str(setting_controlsocket))
+                    except OSError:
+                        setting_controlsocket.unlink()
+                    else:
+                        fallover(f"Control socket {setting_controlsocket} is in use by another running monitor")
+            # Create the socket owner-only from the start, as anyone able to connect can run commands
+            umask = os.umask(0o177)
+            try:
+                control = socketserver.ThreadingUnixStreamServer(str(setting_controlsocket), ControlHandler)
+            finally:
+                os.umask(umask)
+            control.daemon_threads = True
+            threading.Thread(target=control.serve_forever, name="Control socket", daemon=True).start()
+            print(f"{Col.YELL}Control socket:{Col.END} {setting_controlsocket}\n")
+        except OSError as e:
+            print(f"{Col.WHITE}Warning:{Col.END} Unable to open control socket: {e}\n")
+    else:
+        print(f"{Col.WHITE}Warning:{Col.END} Control socket needs Unix domain sockets, which this system lacks\n")
+
+# Create, update or remove Discord outputs to match the configured webhooks (checking they appear valid)
+discords = []
+discord_enabled = False
+discord_session = None
+discord_pool = 0
+def setupdiscord():
+    global discord_enabled, discord_test, discord_session, discord_pool
+    if not discord_available:
+        return
+    current = {(sink.webhook, sink.url, sink.forumchannel): sink for sink in discords}
+    wanted = []
+    for name, webhook in cfg.discord_webhooks.items():
+        url = webhook.get("URL", "") if isinstance(webhook, dict) else webhook
+        forumchannel = webhook.get("ForumChannel", False) if isinstance(webhook, dict) else False
+        if name == DISCORD_DEFAULT:
+            forumchannel = cfg.discord_forumchannel
+        if url and re.search(REG_WEBHOOK, url):
+            sink = current.pop((name, url, forumchannel), None)
+            if sink:
+                sink.call(sink.configure)
+            else:
+                sink = bus.subscribe(DiscordSink(name, url, forumchannel))
+            wanted.append(sink)
+        elif name != DISCORD_DEFAULT:
+            print(f"{Col.WHITE}Warning:{Col.END} Discord webhook '{name}' invalid - messages routed to it won't be sent\n")
+    for sink in current.values():
+        bus.unsubscribe(sink)
+    for target in {name for names in cfg.discord_routes.values() for name in names}:
+        if target not in cfg.discord_webhooks:
+            print(f"{Col.WHITE}Warning:{Col.END} Discord route to unknown webhook '{target}'\n")
+
+    if wanted and len(wanted) > discord_pool:
+        # One keep-alive connection pool shared by every webhook, with room for each webhook's thread to keep its own connection
+        discord_pool = max(DISCORD_POOL, len(wanted))
+        if not discord_session:
+            discord_session = requests.Session()
+        adapter = discord_session.get_adapter("https://")
+        discord_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=discord_pool))
+        adapter.close()
+    elif not wanted and (discord_enabled or track.preloading):
+        print(f"{Col.WHITE}Info:{Col.END} Discord webhook missing or invalid - operating with terminal output only\n")
+    discords[:] = wanted
+    discord_enabled = bool(wanted)
+    discord_test = setting_test and discord_enabled
+
+setupdiscord()
+
+# Re-read the config file when it changes, keeping the current settings if the new ones aren't usable
+def reloadconfig(force=False):
+    global cfg, configstamp
+    try:
+        stat = configfile.stat()
+    except OSError:
+        return
+    if (stat.st_mtime_ns, stat.st_size) == configstamp and not force:
+        return
+    configstamp = (stat.st_mtime_ns, stat.st_size)
+    try:
+        newconfig = loadconfig()
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        warning(f"Config not reloaded: {e}")
+        return
+    newprofile = args.profile if args.profile else track.cmdrname
+    newcfg = Config(newconfig, newprofile if newprofile in newconfig else None)
+    problems = newcfg.problems()
+    if problems:
+        warning(f"Config not reloaded: {"; ".join(problems)}")
+        return
+    cfg = newcfg
+    setupdiscord()
+    debug(f"Log levels: {cfg.loglevel}")
+    if not force:
+        logevent(msg_term=f"Config reloaded", emoji="⚙️", loglevel=1)
 
 # Log events
-def logevent(msg_term, msg_discord=None, emoji="", timestamp=None, loglevel=2, event=None):
+# Either pass the text directly or the name of a compiled message and its values
+def logevent(msg_term=None, msg_discord=None, emoji="", timestamp=None, loglevel=None, event=None, kind=None, message=None, values=None):
+    if loglevel is None:
+        loglevel = getloglevel(kind) if kind else 2
     loglevel = int(loglevel)
     if track.preloading and not discord_test:
         loglevel = 1 if loglevel > 0 else 0
-    if timestamp:
-        logtime = timestamp if setting_utc else timestamp.astimezone()
-    else:
-        logtime = datetime.now(timezone.utc) if setting_utc else datetime.now()
-    logtime = datetime.strftime(logtime, "%H:%M:%S")
-    if loglevel > 0 and not discord_test: print(f"[{logtime}]{emoji} {msg_term}")
+    if not timestamp:
+        timestamp = datetime.now(timezone.utc) if cfg.utc else datetime.now()
     track.logged +=1
-    if discord_enabled and loglevel > 1:
-        if event is not None and track.dupeevent == event:
-            track.duperepeats += 1
-        else:
-            track.duperepeats = 1
-            track.dupewarn = False
-        track.dupeevent = event
-        discord_message = msg_discord if msg_discord else f"**{msg_term}**"
-        ping = f" <@{discord_user}>" if loglevel > 2 and track.duperepeats == 1 else ""
-        logtime = f" {{{logtime}}}" if discord_timestamp else ""
-        if track.duperepeats <= DUPE_MAX:
-            discordsend(f"{emoji} {discord_message}{logtime}{ping}")
-        elif not track.dupewarn:
-            discordsend(f"⏸️ **Suppressing further duplicate messages**{logtime}")
-            track.dupewarn = True
+    bus.publish(Alert(msg_term, msg_discord, emoji, timestamp, loglevel, event, kind,
+                      cfg.messages[message] if message else None, MessageValues(values) if message else None, timestamp.tzinfo is not None and not cfg.utc))
+
+# Warnings while running go through the outputs so they stay in order with events and reach the log file
+def warning(message):
+    logevent(msg_term=f"{Col.WARN}Warning:{Col.END} {message}", loglevel=1, kind="Warning")
 
 # Get log level from config or use default
 def getloglevel(key=None) -> int:
-    if key in loglevel and isinstance(loglevel[key], int):
-        return loglevel[key]
+    if key in cfg.loglevel and isinstance(cfg.loglevel[key], int):
+        return cfg.loglevel[key]
     else:
         level = LOGLEVEL_DEFAULTS.get(key, 1)
-        print(f"{Col.WHITE}Warning:{Col.END} '{key}' not found in 'LogLevels' (using default of {level})")
+        warning(f"'{key}' not found in 'LogLevels' (using default of {level})")
         return level
 
 def perhour(seconds=0, precision=None):
@@ -418,73 +1517,71 @@ def processevent(line):
     try:
         j = json.loads(line)
     except ValueError:
-        print(f"{Col.WHITE}Warning:{Col.END} Journal parsing error, skipping line")
+        warning(f"Journal parsing error, skipping line")
         return
 
     try:
         logtime = datetime.fromisoformat(j["timestamp"]) if "timestamp" in j else None
-        if setting_showcmdr:
+        if cfg.showcmdr:
             CMDRName = "[" + track.cmdrname + "]"
         else:
             CMDRName = ""
         track.thiseventtime = logtime
         match j["event"]:
             case "ShipTargeted" if "Ship" in j:
-                ship = j["Ship_Localised"] if "Ship_Localised" in j else j["Ship"].title()
+                ship = shipname(j["Ship"], j.get("Ship_Localised"))
                 rank = "" if not "PilotRank" in j else f" ({j["PilotRank"]})"
                 if ship != session.lastsecurity and "PilotName" in j and "$ShipName_Police" in j["PilotName"]:
                     session.lastsecurity = ship
-                    logevent(msg_term=f"{CMDRName} {Col.WARN}Scanned security{Col.END} ({ship})",
-                            msg_discord=f"{CMDRName} **Scanned security** ({ship})",
-                            emoji="🚨", timestamp=logtime, loglevel=getloglevel("SecurityScan"))
+                    logevent(message="ScanSecurity", values={"ship": ship},
+                            emoji="🚨", timestamp=logtime, kind="SecurityScan")
                 elif not ship in session.scans and (j["Ship"] in SHIPS_EASY or j["Ship"] in SHIPS_HARD):
                     track.sessionstart()
                     session.scans.append(ship)
                     hard = ""
-                    log = getloglevel("ScanEasy")
+                    log = "ScanEasy"
                     if j["Ship"] in SHIPS_EASY:
                         col = Col.EASY
                     elif j["Ship"] in SHIPS_HARD:
                         col = Col.HARD
-                        log = getloglevel("ScanHard")
+                        log = "ScanHard"
                         hard = " ☠️"
                     else:
                         col = Col.WHITE
-                    logevent(msg_term=f"{CMDRName} {col}Scan{Col.END}: {ship}{rank}",
-                            msg_discord=f"{CMDRName} **{ship}**{hard}{rank}",
-                            emoji="🔎", timestamp=logtime, loglevel=log)
+                    logevent(message="Scan", values={"col": col, "ship": ship, "hard": hard, "rank": rank},
+                            emoji="🔎", timestamp=logtime, kind=log)
             case "Bounty" | "FactionKillBond":
                 track.sessionstart()
                 session.scans.clear()
                 session.kills +=1
                 track.totalkills +=1
                 thiskill = logtime
-                killtime = ""
+                seconds = None
                 track.lastcheck = time.monotonic()
                 session.meritstoreport +=1
                 
                 if session.lastkill:
                     seconds = (thiskill-session.lastkill).total_seconds()
-                    killtime = f" (+{time_format(seconds)})"
                     session.killstime += seconds
                     if len(session.killsrecent) == KILLS_RECENT: session.killsrecent.pop(0)
                     session.killsrecent.append(seconds)
+                    session.killmodel.update(seconds)
                     track.totaltime += seconds
                 session.lastkill = logtime
 
                 hard = ""
-                log = getloglevel("KillEasy")
+                log = "KillEasy"
                 col = Col.WHITE
                 if j["event"] == "Bounty":
                     if j["Target"] in SHIPS_EASY:
                         col = Col.EASY
                     elif j["Target"] in SHIPS_HARD:
                         col = Col.HARD
-                        log = getloglevel("KillHard")
+                        log = "KillHard"
                         hard = " ☠️"
                     
                     bountyvalue = j["Rewards"][0]["Reward"]
-                    ship = j["Target_Localised"] if "Target_Localised" in j else j["Target"].title()
+                    ship = shipname(j["Target"], j.get("Target_Localised"))
                 else:
                     bountyvalue = j["Reward"]
                     ship = "Bond"
@@ -492,15 +1589,10 @@ def processevent(line):
 
                 session.bounties += bountyvalue
                 track.totalbounties += bountyvalue
-                kills_t = f" x{session.kills}" if setting_extendedstats else ""
-                kills_d = f"x{session.kills} " if setting_extendedstats else ""
-                bountyvalue = f" [{num_format(bountyvalue)} cr]" if setting_bountyvalue else ""
                 victimfaction = j["VictimFaction_Localised"] if "VictimFaction_Localised" in j else j["VictimFaction"]
-                bountyfaction = victimfaction if len(victimfaction) <= TRUNC_FACTION+3 else f"{victimfaction[:TRUNC_FACTION].rstrip()}..."
-                bountyfaction = f" [{bountyfaction}]" if setting_bountyfaction else ""
-                logevent(msg_term=f"{CMDRName} {col}Kill{Col.END}{kills_t}: {ship}{killtime}{bountyvalue}{bountyfaction}",
-                        msg_discord=f"{CMDRName} {kills_d}**{ship}{hard}{killtime}**{bountyvalue}{bountyfaction}",
-                        emoji="💥", timestamp=logtime, loglevel=log)
+                logevent(message="Kill", values={"col": col, "kills": session.kills, "ship": ship, "hard": hard, "seconds": seconds,
+                        "bounty": bountyvalue, "faction": victimfaction},
+                        emoji="💥", timestamp=logtime, kind=log)
                 
                 # Output stats every 10 kills
                 if session.kills % 10 == 0:
@@ -508,69 +1600,67 @@ def processevent(line):
                     kills_hour = perhour(avgseconds, 1)
                     avgbounty = session.bounties // session.kills
                     bounties_hour = perhour(session.killstime / session.bounties)
-                    if setting_extendedstats and session.kills > KILLS_RECENT:
+                    if cfg.extendedstats and session.kills > KILLS_RECENT:
                         avgsecondsrecent = sum(session.killsrecent) / (KILLS_RECENT)
-                        kills_hour_recent = f" [Last {KILLS_RECENT}: {perhour(avgsecondsrecent, 1)}/hr]"
+                        kills_hour_recent = perhour(avgsecondsrecent, 1)
                     else:
-                        kills_hour_recent = ""
-                    logevent(msg_term=f"{CMDRName} Session kills: {session.kills:,} ({kills_hour}/hr | {time_format(avgseconds)}/kill){kills_hour_recent}",
-                              msg_discord=f"{CMDRName} **Session kills: {session.kills:,} ({kills_hour}/hr | {time_format(avgseconds)}/kill)**{kills_hour_recent}",
-                            emoji="📝", timestamp=logtime, loglevel=getloglevel("SummaryKills"))
-                    logevent(msg_term=f"{CMDRName} Session {track.killtype}: {num_format(session.bounties)} ({num_format(bounties_hour)}/hr | {num_format(avgbounty)}/kill)",
-                            emoji="📝", timestamp=logtime, loglevel=getloglevel("SummaryBounties"))
+                        kills_hour_recent = None
+                    logevent(message="SummaryKills", values={"kills": session.kills, "killrate": kills_hour, "avgseconds": avgseconds, "recentrate": kills_hour_recent},
+                            emoji="📝", timestamp=logtime, kind="SummaryKills")
+                    logevent(message="SummaryBounties", values={"killtype": track.killtype, "bounties": session.bounties, "bountyrate": bounties_hour, "avgbounty": avgbounty},
+                            emoji="📝", timestamp=logtime, kind="SummaryBounties")
                     if session.merits > 0:
                         avgmerits = session.merits // session.kills
                         merits_hour = perhour(session.killstime / session.merits) if session.merits > 0 else 0
-                        logevent(msg_term=f"{CMDRName} Session merits: {session.merits:,} ({merits_hour:,}/hr | {avgmerits:,}/kill)",
-                                emoji="📝", timestamp=logtime, loglevel=getloglevel("SummaryMerits"))
+                        logevent(message="SummaryMerits", values={"merits": session.merits, "meritrate": merits_hour, "avgmerits": avgmerits},
+                                emoji="📝", timestamp=logtime, kind="SummaryMerits")
                 updatetitle()
             case "MissionRedirected" if "Mission_Massacre" in j["Name"]:
                 track.missionredirects += 1
                 msg = "a mission"
                 missions = f"{track.missionredirects}/{len(track.missionsactive)}"
                 if len(track.missionsactive) != track.missionredirects:
-                    log = getloglevel("Missions")
+                    log = "Missions"
                 else:
-                    log = getloglevel("MissionsAll")
+                    log = "MissionsAll"
                     msg = "all missions!"
                 logevent(msg_term=f"{CMDRName} Completed kills for {msg} ({missions})",
-                        emoji="✅", timestamp=logtime, loglevel=log)
+                        emoji="✅", timestamp=logtime, kind=log)
                 updatetitle()
             case "ReservoirReplenished":
                 fuelremaining = round((j["FuelMain"] / track.fuelcapacity) * 100)
                 if session.fuellasttime and track.deploytime and logtime > session.fuellasttime:
                     fuel_time = (logtime-session.fuellasttime).total_seconds()
                     fuel_hour = 3600 / fuel_time * (session.fuellastremain-j["FuelMain"])
-                    fuel_time_remain = time_format(j["FuelMain"] / fuel_hour * 3600)
-                    fuel_time_remain = f" (~{fuel_time_remain})"
+                    session.fuelremaining = j["FuelMain"] / fuel_hour * 3600
                     #debug(f"Fuel used since previous: {round(session.fuellastremain-j["FuelMain"],2)}t in {time_format(fuel_time)}")
                 else:
-                    fuel_time_remain = ""
+                    session.fuelremaining = None
 
+                track.fuelpercent = fuelremaining
                 session.fuellasttime = logtime
                 session.fuellastremain = j["FuelMain"]
 
                 col = ""
                 level = ":"
-                fuel_loglevel = 0
+                fuel_kind = None
                 if j["FuelMain"] < track.fuelcapacity * FUEL_CRIT:
                     col = Col.BAD
-                    fuel_loglevel = getloglevel("FuelCritical")
+                    fuel_kind = "FuelCritical"
                     level = " critical!"
                 elif j["FuelMain"] < track.fuelcapacity * FUEL_LOW:
                     col = Col.WARN
-                    fuel_loglevel = getloglevel("FuelLow")
+                    fuel_kind = "FuelLow"
                     level = " low:"
                 elif track.deploytime:
-                    fuel_loglevel = getloglevel("FuelReport")
+                    fuel_kind = "FuelReport"
 
-                logevent(msg_term=f"{CMDRName} {col}Fuel: {fuelremaining}% remaining{Col.END}{fuel_time_remain}",
-                    msg_discord=f"{CMDRName} **Fuel{level} {fuelremaining}% remaining**{fuel_time_remain}",
-                    emoji="⛽", timestamp=logtime, loglevel=fuel_loglevel)
+                logevent(message="Fuel", values={"col": col, "level": level, "percent": fuelremaining, "remaining": session.fuelremaining},
+                    emoji="⛽", timestamp=logtime, kind=fuel_kind, loglevel=None if fuel_kind else 0)
             case "FighterDestroyed" if track.lasteventname != "StartJump":
                 logevent(msg_term=f"{CMDRName} {Col.BAD}Fighter destroyed!{Col.END}",
                         msg_discord=f"{CMDRName} **Fighter destroyed!**",
-                        emoji="🕹️", timestamp=logtime, loglevel=getloglevel("FighterDown"))
+                        emoji="🕹️", timestamp=logtime, kind="FighterDown")
             case "LaunchFighter" if not j["PlayerControlled"]:
                 logevent(msg_term=f"{CMDRName} Fighter launched",
                         emoji="🕹️", timestamp=logtime, loglevel=2)
@@ -581,24 +1671,21 @@ def processevent(line):
                 else:
                     shields = "down!"
                     col = Col.BAD
-                logevent(msg_term=f"{CMDRName} {col}Ship shields {shields}{Col.END}",
-                        msg_discord=f"{CMDRName} **Ship shields {shields}**",
-                        emoji="🛡️", timestamp=logtime, loglevel=getloglevel("ShipShields"))
+                logevent(message="ShipShields", values={"col": col, "shields": shields},
+                        emoji="🛡️", timestamp=logtime, kind="ShipShields")
             case "HullDamage":
                 hullhealth = round(j["Health"] * 100)
                 if j["Fighter"] and not j["PlayerPilot"] and track.fighterhull != j["Health"]:
                     track.fighterhull = j["Health"]
-                    logevent(msg_term=f"{CMDRName} {Col.WARN}Fighter hull damaged!{Col.END} (Integrity: {hullhealth}%)",
-                        msg_discord=f"{CMDRName} **Fighter hull damaged!** (Integrity: {hullhealth}%)",
-                        emoji="🕹️", timestamp=logtime, loglevel=getloglevel("FighterHull"))
+                    logevent(message="FighterHull", values={"health": hullhealth},
+                        emoji="🕹️", timestamp=logtime, kind="FighterHull")
                 elif j["PlayerPilot"] and not j["Fighter"]:
-                    logevent(msg_term=f"{CMDRName} {Col.BAD}Ship hull damaged!{Col.END} (Integrity: {hullhealth}%)",
-                        msg_discord=f"{CMDRName} **Ship hull damaged!** (Integrity: {hullhealth}%)",
-                        emoji="🛠️", timestamp=logtime, loglevel=getloglevel("ShipHull"))
+                    logevent(message="ShipHull", values={"health": hullhealth},
+                        emoji="🛠️", timestamp=logtime, kind="ShipHull")
             case "Died":
                 logevent(msg_term=f"{CMDRName} {Col.BAD}Ship destroyed!{Col.END}",
                         msg_discord="{CMDRName} **Ship destroyed!**",
-                        emoji="💀", timestamp=logtime, loglevel=getloglevel("Died"))
+                        emoji="💀", timestamp=logtime, kind="Died")
             case "Music" if j["MusicTrack"] == "MainMenu":
                 track.sessionend()
                 logevent(msg_term="{CMDRName} Exited to main menu",
@@ -622,19 +1709,19 @@ def processevent(line):
             case "ReceiveText" if j["Channel"] == "npc":
                 if any(x in j["Message"] for x in BAIT_MESSAGES):
                     session.baitfails += 1
-                    baitfails = f" (x{session.baitfails})" if setting_extendedstats else ""
+                    baitfails = f" (x{session.baitfails})" if cfg.extendedstats else ""
                     logevent(msg_term=f"{CMDRName} {Col.WARN}Pirate didn\"t engage due to insufficient cargo value{baitfails}{Col.END}",
                             msg_discord=f"{CMDRName} **Pirate didn\"t engage due to insufficient cargo value**{baitfails}",
-                            emoji="🎣", timestamp=logtime, loglevel=getloglevel("BaitValueLow"), event="BaitValueLow")
+                            emoji="🎣", timestamp=logtime, kind="BaitValueLow", event="BaitValueLow")
                 elif "Police_Attack" in j["Message"]:
                     logevent(msg_term=f"{CMDRName} {Col.BAD}Under attack by security services!{Col.END}",
                             msg_discord=f"{CMDRName} **Under attack by security services!**",
-                            emoji="🚨", timestamp=logtime, loglevel=getloglevel("SecurityAttack"))
+                            emoji="🚨", timestamp=logtime, kind="SecurityAttack")
             case "EjectCargo" if not j["Abandoned"] and j["Count"] == 1:
                 name = j["Type_Localised"] if "Type_Localised" in j else j["Type"].title()
                 logevent(msg_term=f"{CMDRName} {Col.BAD}Cargo stolen!{Col.END} ({name})",
                         msg_discord=f"{CMDRName} **Cargo stolen!** ({name})",
-                        emoji="📦", timestamp=logtime, loglevel=getloglevel("CargoLost"), event="CargoLost")
+                        emoji="📦", timestamp=logtime, kind="CargoLost", event="CargoLost")
             case "Rank":
                 track.cmdrcombatrank = j["Combat"]
             case "Progress":
@@ -647,23 +1734,23 @@ def processevent(line):
                         track.missionsactive.append(mission["MissionID"])
                 track.missions = True
                 logevent(msg_term=f"{CMDRName} Missions loaded (active massacres: {len(track.missionsactive)})",
-                        emoji="🎯", timestamp=logtime, loglevel=getloglevel("Missions"))
+                        emoji="🎯", timestamp=logtime, kind="Missions")
             case "MissionAccepted" if "Mission_Massacre" in j["Name"] and track.missions:
                 track.missionsactive.append(j["MissionID"])
                 logevent(msg_term=f"{CMDRName} Accepted massacre mission (active: {len(track.missionsactive)})",
-                        emoji="🎯", timestamp=logtime, loglevel=getloglevel("Missions"))
+                        emoji="🎯", timestamp=logtime, kind="Missions")
             case "MissionAbandoned" | "MissionCompleted" | "MissionFailed" if track.missions and j["MissionID"] in track.missionsactive:
                 track.missionsactive.remove(j["MissionID"])
                 if track.missionredirects > 0: track.missionredirects -= 1
                 event = j["event"][7:].lower()
                 logevent(msg_term=f"{CMDRName} Massacre mission {event} (active: {len(track.missionsactive)})",
-                        emoji="🎯", timestamp=logtime, loglevel=getloglevel("Missions"))
+                        emoji="🎯", timestamp=logtime, kind="Missions")
             case "PowerplayMerits":
                 if session.meritstoreport > 0 and j["MeritsGained"] < 500:
                     session.merits += j["MeritsGained"]
                     track.totalmerits += j["MeritsGained"]
-                    logevent(msg_term=f"{CMDRName} Merits: +{j["MeritsGained"]} ({j["Power"]})",
-                             emoji="🎫", timestamp=logtime, loglevel=getloglevel("Merits"))
+                    logevent(message="Merits", values={"merits": j["MeritsGained"], "power": j["Power"]},
+                             emoji="🎫", timestamp=logtime, kind="Merits")
                     session.meritstoreport -= 1
             case "Location" if j["BodyType"] == "PlanetaryRing":
                 track.sessionstart()
@@ -671,7 +1758,9 @@ def processevent(line):
             case "Shutdown":
                 logevent(msg_term="{CMDRName} Quit to desktop",
                         emoji="🛑", timestamp=logtime, loglevel=2)
-                if __name__ == "__main__": sys.exit()
+                if setting_daemon:
+                    track.gameexit = findjournal()
+                elif __name__ == "__main__": sys.exit()
             case "SupercruiseEntry" | "FSDJump":
                 event = "Supercruise entry in" if j["event"] == "SupercruiseEntry" else "FSD jump to"
                 #debug(f"{event} {j["StarSystem"]}")
@@ -682,69 +1771,139 @@ def processevent(line):
     except Exception as e:
         event = j["event"] if "event" in j else "[unknown]"
         logtime = datetime.strftime(logtime, "%H:%M:%S") if logtime else "[unknown]"
-        print(f"{Col.WARN}Warning:{Col.END} Process event error for [{event}]: {e} (logtime: {logtime})")
+        warning(f"Process event error for [{event}]: {e} (logtime: {logtime})")
         debug(line)
 
-def time_format(seconds: int) -> str:
-    if seconds is not None:
-        seconds = int(seconds)
-        h = seconds // 3600
-        m = seconds % 3600 // 60
-        s = seconds % 3600 % 60
-        if h > 0:
-            return "{:d}h{:d}m".format(h, m)
-        elif m > 0:
-            return "{:d}m{:d}s".format(m, s)
-        else:
-            return "{:d}s".format(s)
-
-def num_format(number: int) -> str:
-    if number is not None:
-        number = int(number)
-        if number >= 999_500:
-            return f"{round(number / 1_000_000, 1):g}m"
-        elif number >= 1_000:
-            return f"{round(number / 1_000):g}k"
+# Live session figures shared by the window title and dashboard
+# Also read from other threads, so values that change together are taken once and checked before use
+def sessionstatus():
+    timeutc = datetime.now(timezone.utc)
+    deploytime = track.deploytime
+    lastkill = session.lastkill
+    killsrecent = list(session.killsrecent)
+    fuellasttime = session.fuellasttime
+    status = {"cmdr": track.cmdrname, "journal": journal_file, "deployed": bool(deploytime), "kills": session.kills,
+              "killtype": track.killtype, "bounties": session.bounties, "merits": session.merits,
+              "missions": track.missionredirects, "missionsactive": len(track.missionsactive),
+              "sessiontime": None, "sincekill": None, "killrate": None, "killraterecent": None, "bountyrate": None,
+              "fuel": track.fuelpercent, "fuelremaining": None}
+    if deploytime:
+        status["sessiontime"] = (timeutc - deploytime).total_seconds()
+        if status["kills"] > 0 and lastkill:
+            status["killrate"] = perhour(status["sessiontime"] / status["kills"], 1)
+            status["bountyrate"] = perhour(status["sessiontime"] / status["bounties"]) if status["bounties"] else 0
+            status["sincekill"] = (timeutc - lastkill).total_seconds()
         else:
-            return number
+            status["sincekill"] = status["sessiontime"]
+    if len(killsrecent) == KILLS_RECENT:
+        status["killraterecent"] = perhour(sum(killsrecent) / KILLS_RECENT, 1)
+    fuelremaining = session.fuelremaining
+    if fuelremaining is not None and fuellasttime:
+        status["fuelremaining"] = max(0, fuelremaining - (timeutc - fuellasttime).total_seconds())
+    return status
 
 def updatetitle(reset=False):
     # Title (Windows-only)
     if os.name=="nt":
-        if setting_dynamictitle and not track.preloading and track.deploytime:
-            timeutc = datetime.now(timezone.utc)
-            if session.kills > 0:
-                kills_hour = perhour((timeutc - track.deploytime).total_seconds() / session.kills, 1)
-                kills_hour = f"{kills_hour}/h" if session.kills > 19 else f"{kills_hour}*/h"
-                lastkill = time_format(round((timeutc - session.lastkill).total_seconds()))
+        if cfg.dynamictitle and not track.preloading and track.deploytime:
+            status = sessionstatus()
+            if status["killrate"] is not None:
+                kills_hour = f"{status["killrate"]}/h" if session.kills > 19 else f"{status["killrate"]}*/h"
             else:
                 kills_hour = "-/h"
-                lastkill = time_format(round((timeutc - track.deploytime).total_seconds()))
+            lastkill = time_format(round(status["sincekill"]))
             
-            ctypes.windll.kernel32.SetConsoleTitleW(f"💥{kills_hour} ⌚{lastkill} 🎯{track.missionredirects}/{len(track.missionsactive)}")
+            ctypes.windll.kernel32.SetConsoleTitleW(f"💥{kills_hour} ⌚{lastkill} 🎯{status["missions"]}/{status["missionsactive"]}")
         elif reset == True:
             ctypes.windll.kernel32.SetConsoleTitleW(f"ED AFK Monitor v{VERSION}")
             debug("Title update")
 
-def shutdown():
+def logtotals():
     if track.totalkills > 1:
         avgseconds = track.totaltime / (track.totalkills - 1)
         kills_hour = perhour(avgseconds, 1)
         avgbounty = track.totalbounties // track.totalkills
         bounties_hour = perhour(track.totaltime / track.totalbounties)
         logevent(msg_term=f"Total kills: {track.totalkills:,} ({kills_hour}/hr | {time_format(avgseconds)}/kill)",
-                emoji="📝", loglevel=getloglevel("SummaryKills"))
+                emoji="📝", kind="SummaryKills")
         logevent(msg_term=f"Total {track.killtype}: {num_format(track.totalbounties)} ({num_format(bounties_hour)}/hr | {num_format(avgbounty)}/kill)",
-                emoji="📝", loglevel=getloglevel("SummaryBounties"))
+                emoji="📝", kind="SummaryBounties")
         if track.totalmerits > 0:
             avgmerits = track.totalmerits // track.totalkills
             merits_hour = perhour(track.totaltime / track.totalmerits) if track.totalmerits > 0 else 0
             logevent(msg_term=f"Total merits: {track.totalmerits:,} ({merits_hour:,}/hr | {avgmerits:,}/kill)",
-                    emoji="📝", loglevel=getloglevel("SummaryMerits"))
+                    emoji="📝", kind="SummaryMerits")
+
+def shutdown():
+    logtotals()
     logevent(msg_term=f"Monitor stopped ({journal_file})",
             msg_discord=f"**Monitor stopped** ({journal_file})",
             emoji="📕", loglevel=2)
 
+# Latest live journal, or the named one if it's valid
+def findjournal(name=None):
+    if name:
+        valid = re.search(REG_JOURNAL, name) and not name.endswith(JOURNAL_ARCHIVES) and (journal_dir / name).is_file()
+        return name if valid else None
+    journals = [entry.name for entry in journal_dir.iterdir() if re.search(REG_JOURNAL, entry.name) and not entry.name.endswith(JOURNAL_ARCHIVES)]
+    return max(journals, default=None)
+
+# Run control socket commands on the main thread between journal lines, returning any journal to switch to
+def runcommands():
+    switchto = None
+    while not controlqueue.empty():
+        command, argument, result, claim = controlqueue.get()
+        if not claim.acquire(blocking=False):
+            continue	# Timed out and already answered as busy
+        match command:
+            case "reset":
+                session.reset()
+                logevent(msg_term=f"Session stats reset",
+                        emoji="🔄", loglevel=1)
+                result.put({"ok": True})
+            case "flush":
+                logtotals()
+                bus.flush(localonly=True)
+                result.put({"ok": True, "status": sessionstatus()})
+            case "switch":
+                journal = findjournal(argument)
+                if not journal:
+                    result.put({"ok": False, "error": f"Journal '{argument}' invalid or not found" if argument else "No journals found"})
+                elif journal == journal_file or journal == switchto:
+                    result.put({"ok": False, "error": f"Already monitoring {journal}"})
+                else:
+                    switchto = journal
+                    result.put({"ok": True, "journal": journal})
+    return switchto
+
+# Pick up monitoring on another journal as if restarted on it, keeping the outputs and control socket
+def switchjournal(filename):
+    global journal_file, track
+    shutdown()
+    journal_file = filename
+    cmdrname = track.cmdrname
+    session.reset()
+    track = Tracking()
+    try:
+        with openjournal(journal_dir / journal_file) as file:
+            for line in file:
+                entry = json.loads(line)
+                if entry["event"] == "Commander":
+                    cmdrname = entry["Name"]
+                    break
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[CMDR Name] Unable to read {journal_file}: {e}")
+    track.cmdrname = cmdrname
+    reloadconfig(force=True)
+    for discord in discords:
+        discord.call(discord.newthread)
+    print(f"{Col.YELL}Journal file:{Col.END} {journal_file}")
+
+# Stop on SIGTERM (e.g. from systemd) the same way as Ctrl+C so the totals still get sent
+def terminate(signum, frame):
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    sys.exit()
+
 def header():
     # Print header
     print(f"{Col.YELL}Journal folder:{Col.END} {journal_dir}")
@@ -753,108 +1912,163 @@ def header():
     print("\nStarting... (Press Ctrl+C to stop)\n")
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, terminate)
+    compactor = None
     try:
-        # Journal preloading
-        with open(journal_dir / journal_file, mode="r", encoding="utf-8") as file:
-            for line in file:
-                processevent(line)
-                track.lines += 1
-        track.preloading = False
-        if args.resetsession:
-            session.reset()
-            logevent(msg_term=f"Session stats reset",
-                    emoji="🔄", loglevel=1)
-        updatetitle(True)
+        while True:
+            # Journal preloading
+            try:
+                with openjournal(journal_dir / journal_file) as file:
+                    for line in file:
+                        processevent(line)
+                        track.lines += 1
+            except (OSError, EOFError) as e:
+                fallover(f"Unable to read journal {journal_file}: {e}")
 
-        # Send Discord startup
-        update_notice = f"\n:arrow_up: Update **[v{latest_version}](https://github.com/{GITHUB_REPO}/releases)** available!" if VERSION < latest_version else ""
+            # Archived journals are history, so report on them without watching for more
+            if journal_file.endswith(JOURNAL_ARCHIVES):
+                bus.flush()
+                print(f"\n{Col.WHITE}Info:{Col.END} Archived journal loaded - not watching for new events\n")
+                sys.exit()
 
-        if discord_forumchannel:
-            discordsend(f"💥 **ED AFK Monitor** 💥 by CMDR PSIPAB ([v{VERSION}](https://github.com/{GITHUB_REPO})){update_notice}")
-            webhook.content += f" <@{discord_user}>"
-            webhook.edit()
-        else:
-            discordsend(f"# 💥 ED AFK Monitor 💥\n-# by CMDR PSIPAB ([v{VERSION}](https://github.com/{GITHUB_REPO})){update_notice}")
+            track.preloading = False
+            track.started = datetime.now(timezone.utc)
+            bus.flush()
+            if args.resetsession:
+                session.reset()
+                logevent(msg_term=f"Session stats reset",
+                        emoji="🔄", loglevel=1)
+            updatetitle(True)
+
+            # Send Discord startup
+            update_notice = f"\n:arrow_up: Update **[v{latest_version}](https://github.com/{GITHUB_REPO}/releases)** available!" if VERSION < latest_version else ""
+
+            # Only the default webhook gets the banner, so routed channels just see their own messages
+            for discord in discords:
+                if discord.webhook != DISCORD_DEFAULT:
+                    continue
+                if discord.forumchannel:
+                    discord.call(discord.announce, f"💥 **ED AFK Monitor** 💥 by CMDR PSIPAB ([v{VERSION}](https://github.com/{GITHUB_REPO})){update_notice}")
+                else:
+                    discord.call(discord.announce, f"# 💥 ED AFK Monitor 💥\n-# by CMDR PSIPAB ([v{VERSION}](https://github.com/{GITHUB_REPO})){update_notice}")
         
-        logevent(msg_term=f"Monitor started ({journal_file})",
-                msg_discord=f"**Monitor started** ({journal_file})",
-                emoji="📖", loglevel=2)
+            logevent(msg_term=f"Monitor started ({journal_file})",
+                    msg_discord=f"**Monitor started** ({journal_file})",
+                    emoji="📖", loglevel=2)
         
-        # Open journal from end and watch for new lines
-        trackingerror = None
-        cooldown = WARN_COOLDOWN
+            if args.compact is not None and not compactor:
+                compactor = threading.Thread(target=compactjournals, args=(args.compact,), name="Compact journals", daemon=True)
+                compactor.start()
+
+            # Open journal from end and watch for new lines
+            trackingerror = None
+            cooldown = WARN_COOLDOWN
         
-        with open(journal_dir / journal_file, mode="r", encoding="utf-8") as file:
-            file.seek(0, 2)
+            with open(journal_dir / journal_file, mode="r", encoding="utf-8") as file:
+                file.seek(0, 2)
 
-            while True:
-                line = file.readline()
-                if not line:
-                    try:
-                        if track.deploytime:
-                            # Check for instance problems every minute
-                            timemono = time.monotonic()
-                            if not track.lastcheck or timemono - track.lastcheck >= 60:
-                                timeutc = datetime.now(timezone.utc)
-                                sessionsecs = (timeutc - track.deploytime).total_seconds()
-                                if sessionsecs == 0: sessionsecs = 1	# Avoid divide-by-zero if session started by first kill
-                                #if track.lastcheck: debug(f"Last: {track.lastcheck} / This: {timemono} / Drift: {60-(timemono - track.lastcheck)}")
-                                timemono = timemono + (60 - (timemono - track.lastcheck)) if track.lastcheck else timemono	# Account for drift
-                                track.lastcheck = timemono
+                while True:
+                    line = file.readline()
+                    if not line:
+                        try:
+                            if track.deploytime:
+                                # Check for spawns stopping as soon as the kill rate model allows, sharing the cooldown with the
+                                # other kill rate warnings and only once a kill has been seen live
+                                killmodel = session.killmodel
+                                if (session.kills and cfg.stalesensitivity and killmodel.ready() and not killmodel.warned
+                                        and not track.warnedkillrate and not track.warnednokills and session.lastkill >= track.started):
+                                    sincekill = (datetime.now(timezone.utc) - session.lastkill).total_seconds()
+                                    if killmodel.surprise(sincekill) >= cfg.stalesensitivity:
+                                        logevent(msg_term=f"Spawns have likely stopped (no kills for {time_format(sincekill)}, usually every {time_format(killmodel.mean)})",
+                                                emoji="⚠️", kind="SpawnsStopped")
+                                        killmodel.warn()
+                                        track.warnedkillrate = time.monotonic()
+
+                                # Check for instance problems every minute
+                                timemono = time.monotonic()
+                                if not track.lastcheck or timemono - track.lastcheck >= 60:
+                                    timeutc = datetime.now(timezone.utc)
+                                    sessionsecs = (timeutc - track.deploytime).total_seconds()
+                                    if sessionsecs == 0: sessionsecs = 1	# Avoid divide-by-zero if session started by first kill
+                                    #if track.lastcheck: debug(f"Last: {track.lastcheck} / This: {timemono} / Drift: {60-(timemono - track.lastcheck)}")
+                                    timemono = timemono + (60 - (timemono - track.lastcheck)) if track.lastcheck else timemono	# Account for drift
+                                    track.lastcheck = timemono
                                 
-                                if session.kills:
-                                    # Clear last warned time if past cooldown
-                                    if track.warnedkillrate and timemono - track.warnedkillrate >= (cooldown * 60):
-                                        cooldown *= 2
-                                        track.warnedkillrate = None
+                                    if session.kills:
+                                        # Clear last warned time if past cooldown
+                                        if track.warnedkillrate and timemono - track.warnedkillrate >= (cooldown * 60):
+                                            cooldown *= 2
+                                            track.warnedkillrate = None
                                     
-                                    # Check average kill rate
-                                    kills_hour = perhour(sessionsecs / session.kills, 1)
-                                    #debug(f"Kills per hour {kills_hour}")
-                                    if kills_hour < setting_warnkillrate:
-                                        if not track.warnedkillrate and sessionsecs >= (5 * 60) and (not track.warnednokills or
-                                                timemono - track.warnednokills >= (5 * 60)):
-                                            logevent(msg_term=f"Kill rate of {kills_hour}/h is below {setting_warnkillrate}/h threshold",
-                                                    emoji="⚠️", loglevel=getloglevel("KillRate"))
-                                            track.warnedkillrate = timemono
+                                        # Check average kill rate
+                                        kills_hour = perhour(sessionsecs / session.kills, 1)
+                                        #debug(f"Kills per hour {kills_hour}")
+                                        if kills_hour < cfg.warnkillrate:
+                                            if not track.warnedkillrate and sessionsecs >= (5 * 60) and (not track.warnednokills or
+                                                    timemono - track.warnednokills >= (5 * 60)):
+                                                logevent(msg_term=f"Kill rate of {kills_hour}/h is below {cfg.warnkillrate}/h threshold",
+                                                        emoji="⚠️", kind="KillRate")
+                                                track.warnedkillrate = timemono
+                                        else:
+                                        # Check time since last kill
+                                            lastkill = int((timeutc - session.lastkill).total_seconds() / 60)
+                                            #debug(f"timeutc: {timeutc} | lastkill: {lastkill} | track.warnedkillrate: {track.warnedkillrate} | cfg.warnnokills: {cfg.warnnokills}")
+                                            if not track.warnedkillrate and lastkill >= (cfg.warnnokills):
+                                                logevent(msg_term=f"Last logged kill was {lastkill} minutes ago",
+                                                    emoji="⚠️", kind="NoKills")
+                                                track.warnedkillrate = timemono
                                     else:
-                                    # Check time since last kill
-                                        lastkill = int((timeutc - session.lastkill).total_seconds() / 60)
-                                        #debug(f"timeutc: {timeutc} | lastkill: {lastkill} | track.warnedkillrate: {track.warnedkillrate} | setting_warnnokills: {setting_warnnokills}")
-                                        if not track.warnedkillrate and lastkill >= (setting_warnnokills):
-                                            logevent(msg_term=f"Last logged kill was {lastkill} minutes ago",
-                                                emoji="⚠️", loglevel=getloglevel("NoKills"))
-                                            track.warnedkillrate = timemono
-                                else:
-                                    # Clear last warned time if past cooldown
-                                    if track.warnednokills and timemono - track.warnednokills >= (cooldown * 60):
-                                        track.warnednokills = None
-
-                                    # Check time since deployment if no kills yet
-                                    sessionmins = int(sessionsecs / 60)
-                                    #debug(f"No kills logged since start of session {sessionmins} ({sessionsecs / 60}) minutes ago [WARN_NOKILLS*60: {WARN_NOKILLS * 60}]")
-                                    if not track.warnednokills and sessionsecs >= (WARN_NOKILLS * 60):
-                                        logevent(msg_term=f"No kills logged for {sessionmins} minutes",
-                                                emoji="⚠️", loglevel=getloglevel("NoKills"))
-                                        track.warnednokills = timemono
-                    except Exception as e:
-                        if repr(e) != trackingerror:
-                            print(f"{Col.WARN}Warning:{Col.END} Kill rate tracking error: {e} [{datetime.strftime(datetime.now(), "%H:%M:%S")}])")
-                            trackingerror = repr(e)
+                                        # Clear last warned time if past cooldown
+                                        if track.warnednokills and timemono - track.warnednokills >= (cooldown * 60):
+                                            track.warnednokills = None
+
+                                        # Check time since deployment if no kills yet
+                                        sessionmins = int(sessionsecs / 60)
+                                        #debug(f"No kills logged since start of session {sessionmins} ({sessionsecs / 60}) minutes ago [WARN_NOKILLS*60: {WARN_NOKILLS * 60}]")
+                                        if not track.warnednokills and sessionsecs >= (WARN_NOKILLS * 60):
+                                            logevent(msg_term=f"No kills logged for {sessionmins} minutes",
+                                                    emoji="⚠️", kind="NoKills")
+                                            track.warnednokills = timemono
+                        except Exception as e:
+                            if repr(e) != trackingerror:
+                                warning(f"Kill rate tracking error: {e}")
+                                trackingerror = repr(e)
                     
-                    time.sleep(1)
-                    updatetitle()
-                    continue
+                        time.sleep(1)
+                        updatetitle()
+                        reloadconfig()
+                        switchto = runcommands()
+                        if not switchto and track.gameexit:
+                            newest = findjournal()
+                            if newest != track.gameexit:
+                                switchto = newest	# The game has started again
+                        if switchto:
+                            break
+                        continue
+
+                    processevent(line)
+                    track.lines += 1
 
-                processevent(line)
-                track.lines += 1
+            switchjournal(switchto)
 
-    except (KeyboardInterrupt, SystemExit):
+    except (KeyboardInterrupt, SystemExit) as e:
         shutdown()
+        bus.close()
+        if control:
+            control.server_close()
+            setting_controlsocket.unlink(missing_ok=True)
         debug(f"\nTrack: {track.__dict__}")
-        if sys.argv[0].count("\\") > 1:
+        if sys.argv[0].count("\\") > 1 and not setting_daemon:
             input("\nPress ENTER to exit")	# This is *still* horrible
             sys.exit()
+        if isinstance(e, SystemExit):
+            raise
     except Exception as e:
+        bus.close()
+        if control:
+            control.server_close()
+            setting_controlsocket.unlink(missing_ok=True)
         print(f"{Col.WARN}Warning:{Col.END} Something went wrong: {e} (journal line #{track.lines})")
+        if setting_daemon:
+            sys.exit(1)
         input("Press ENTER to exit")